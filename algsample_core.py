@@ -2,7 +2,7 @@ import itertools
 import os
 import json
 import random
-from typing import List, Set, Tuple
+from typing import Iterator, List, Optional, Set, Tuple
 
 def get_frozen_j_subsets(j_subsets: List[Set[int]]) -> List[frozenset]:
     return [frozenset(sub) for sub in j_subsets]
@@ -15,31 +15,47 @@ def validate_k_subset(k_sub: tuple, frozen_j_subs: List[frozenset], s: int) -> L
             covered_js.append(j_idx)
     return covered_js
 
+class SubsetView:
+    def __init__(self, samples: List[int], r: int, count: int):
+        self.samples = sorted(samples)
+        self.r = r
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for subset in itertools.combinations(self.samples, self.r):
+            yield list(subset)
+
+
 class AlgSampleSelector:
     def __init__(self):
         self.db_dir = "algsample_db"
         os.makedirs(self.db_dir, exist_ok=True)
 
-    def validate_params(self, m: int, n: int, k: int, j: int, s: int) -> bool:
+    def validate_params(self, m: int, n: int, k: int, j: int, s: int, quiet: bool = False) -> bool:
+        error = self._param_error(m, n, k, j, s)
+        if error is None:
+            return True
+        if not quiet:
+            print(error)
+        return False
+
+    def _param_error(self, m: int, n: int, k: int, j: int, s: int) -> Optional[str]:
         if not (45 <= m <= 54):
-            print("错误：m必须在45-54之间")
-            return False
+            return "错误：m必须在45-54之间"
         if not (7 <= n <= 25):
-            print("错误：n必须在7-25之间")
-            return False
+            return "错误：n必须在7-25之间"
         if not (4 <= k <= 7):
-            print("错误：k必须在4-7之间")
-            return False
+            return "错误：k必须在4-7之间"
         if not (s <= j <= k):
-            print("错误：j必须满足s≤j≤k")
-            return False
+            return "错误：j必须满足s≤j≤k"
         if not (3 <= s <= 7):
-            print("错误：s必须在3-7之间")
-            return False
+            return "错误：s必须在3-7之间"
         if n > m:
-            print("错误：n不能大于m")
-            return False
-        return True
+            return "错误：n不能大于m"
+        return None
 
     def generate_initial_n_samples(self, m: int, n: int, custom_samples: List[int] = None) -> Tuple[Set[int], List[int]]:
         if custom_samples:
@@ -53,81 +69,69 @@ class AlgSampleSelector:
         return sample_set, sample_list
 
     def get_all_j_subsets(self, n_samples: Set[int], j: int) -> Tuple[List[Set[int]], List[List[int]]]:
-        subsets_set = [set(subset) for subset in itertools.combinations(n_samples, j)]
-        subsets_list = [sorted(list(subset)) for subset in itertools.combinations(n_samples, j)]
+        subsets_list = [list(subset) for subset in itertools.combinations(sorted(n_samples), j)]
+        subsets_set = [set(subset) for subset in subsets_list]
         return subsets_set, subsets_list
 
     def get_all_k_subsets(self, n_samples: Set[int], k: int) -> List[List[int]]:
-        return [sorted(list(subset)) for subset in itertools.combinations(n_samples, k)]
+        return [list(subset) for subset in itertools.combinations(sorted(n_samples), k)]
+
+    def find_min_valid_k_subsets(self, m: int, n: int, k: int, j: int, s: int, custom_samples: List[int] = None, quiet: bool = False, max_groups: int = 0, time_limit_ms: int = 0) -> Tuple[List[List[int]], dict]:
+        from solver import solve
+        from validator import validate
 
-    def find_min_valid_k_subsets(self, m: int, n: int, k: int, j: int, s: int, custom_samples: List[int] = None) -> Tuple[List[List[int]], dict]:
-        if not self.validate_params(m, n, k, j, s):
+        if not self.validate_params(m, n, k, j, s, quiet):
             return [], {}
         n_sample_set, n_sample_list = self.generate_initial_n_samples(m, n, custom_samples)
-        j_subsets_set, j_subsets_list = self.get_all_j_subsets(n_sample_set, j)
-        all_k_subsets = self.get_all_k_subsets(n_sample_set, k)
         total_m_choose_n = self.combination(m, n)
-        total_n_choose_j = len(j_subsets_list)
-        total_n_choose_k = len(all_k_subsets)
-        
-        if not j_subsets_set:
-            print("无有效j子集")
+        total_n_choose_j = self.combination(n, j)
+        total_n_choose_k = self.combination(n, k)
+
+        if total_n_choose_j == 0:
+            if not quiet:
+                print("无有效j子集")
+            return [], {}
+
+        params = {"m": m, "n": n, "k": k, "j": j, "s": s, "max_groups": max_groups, "time_limit_ms": time_limit_ms}
+        solve_out = solve(params, n_sample_list)
+        selected_k_subsets = solve_out["groups"]
+        stopped = solve_out["stats"].get("stopped")
+        val_out = validate(params, sorted(n_sample_list), selected_k_subsets, mode="fast")
+        if stopped != "ok" or val_out["pass"] is not True:
+            if not quiet:
+                print(f"错误：未找到有效覆盖（stopped={stopped}, validate={val_out['details']}）")
             return [], {}
-        
-        frozen_j_subs = get_frozen_j_subsets(j_subsets_set)
-        covered_js_list = [validate_k_subset(tuple(k_sub), frozen_j_subs, s) for k_sub in all_k_subsets]
-        
-        k_subset_to_covered_js = {}
-        valid_k_indices = []
-        valid_k_subsets = []
-        for k_idx, (k_sub, covered_js) in enumerate(zip(all_k_subsets, covered_js_list)):
-            if covered_js:
-                k_subset_to_covered_js[k_idx] = covered_js
-                valid_k_indices.append(k_idx)
-                valid_k_subsets.append(k_sub)
-        
-        uncovered_js = set(range(len(j_subsets_set)))
-        selected_k_indices = []
-        while uncovered_js:
-            best_k_idx = None
-            best_coverage = set()
-            for k_idx, covered_js in k_subset_to_covered_js.items():
-                coverage = set(covered_js) & uncovered_js
-                if len(coverage) > len(best_coverage):
-                    best_coverage = coverage
-                    best_k_idx = k_idx
-            if best_k_idx is None:
-                break
-            selected_k_indices.append(best_k_idx)
-            uncovered_js -= best_coverage
-        
-        selected_k_subsets = [all_k_subsets[idx] for idx in selected_k_indices]
         selected_count = len(selected_k_subsets)
-        
+
+        # s <= j <= k, so every k-subset covers at least one j-subset.
         detail_info = {
             "total_m_choose_n": total_m_choose_n,
             "total_n_choose_j": total_n_choose_j,
             "total_n_choose_k": total_n_choose_k,
             "initial_n_samples": n_sample_list,
-            "all_j_subsets": j_subsets_list,
-            "all_k_subsets": all_k_subsets,
-            "valid_k_subsets_count": len(valid_k_subsets),
-            "selected_k_subsets_count": selected_count
+            "all_j_subsets": SubsetView(n_sample_list, j, total_n_choose_j),
+            "all_k_subsets": SubsetView(n_sample_list, k, total_n_choose_k),
+            "valid_k_subsets_count": total_n_choose_k,
+            "selected_k_subsets_count": selected_count,
+            "solver_stats": solve_out["stats"]
         }
-        
+
+        if quiet:
+            return selected_k_subsets, detail_info
+
         print("\n=== 样本选择详细信息 ===")
         print(f"参数：m={m}, n={n}, k={k}, j={j}, s={s}")
         print(f"从m={m}个样本中选n={n}个的总组合数：{total_m_choose_n}")
         print(f"初始选中的n个样本：{n_sample_list}")
         print(f"从n={n}个样本中选j={j}个的总组合数：{total_n_choose_j}")
         print(f"从n={n}个样本中选k={k}个的总组合数：{total_n_choose_k}")
-        print(f"有效k样本子集总数（满足条件）：{len(valid_k_subsets)}")
+        print(f"有效k样本子集总数（满足条件）：{total_n_choose_k}")
         print(f"优化后最小有效k样本子集数：{selected_count}")
         print("\n=== 优化后最小有效k样本子集 ===")
         for i, subset in enumerate(selected_k_subsets, 1):
             print(f"{i}. {subset}")
         print("\n" + "="*50)
-        
+
         return selected_k_subsets, detail_info
 
     def combination(self, a: int, b: int) -> int:
@@ -154,7 +158,7 @@ class AlgSampleSelector:
         }
         
         with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False, default=list)
         print(f"结果已保存到：{file_path}")
         print(f"文件包含：参数、所有组合数、初始样本、所有j/k子集、有效子集、选中子集")
         return file_path
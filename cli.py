@@ -1,15 +1,18 @@
 import argparse
+import json
 import random
 from typing import List
 
-from solver import solve
+from solver import Solver, better_result, solve, solve_incremental
 from validator import validate
-from dbio import save_run, list_runs, load_run, delete_run
+from checkpoint import save_checkpoint, load_checkpoint, remove_checkpoint
+from dbio import save_run, load_run, delete_run, refresh_index, compact_runs
 import os
 
 
 
 DB_DIR = "algsample_db"
+COV_CACHE_DIR = "algsample_cache"
 
 
 def parse_samples(text: str) -> List[int]:
@@ -18,6 +21,10 @@ def parse_samples(text: str) -> List[int]:
 
 
 def cmd_run(args: argparse.Namespace) -> None:
+    if not args.resume and None in (args.m, args.n, args.k, args.j, args.s):
+        print("--m, --n, --k, --j and --s are required unless --resume is given")
+        return
+
     params_base = {
         "m": args.m,
         "n": args.n,
@@ -30,25 +37,61 @@ def cmd_run(args: argparse.Namespace) -> None:
         "time_limit_ms": args.time_limit_ms,
         "trials": args.trials,
         "score_cap": args.score_cap,
-        "enum_work_limit": args.enum_work_limit
+        "enum_work_limit": args.enum_work_limit,
+        "cov_cache_dir": (None if args.no_cov_cache else args.cov_cache_dir),
+        "method": args.method,
+        "portfolio_workers": args.portfolio_workers
     }
+    restarts = max(1, args.restarts)
 
-    if args.samples is None:
-        samples = random.sample(range(1, args.m + 1), args.n)
+    best = None
+    start = 0
+    solve_state = None
+
+    if not args.resume:
+        if args.samples is None:
+            samples = random.sample(range(1, args.m + 1), args.n)
+        else:
+            samples = parse_samples(args.samples)
     else:
-        samples = parse_samples(args.samples)
+        ck = load_checkpoint(args.resume)
+        if not ck:
+            print("checkpoint not found")
+            return
+        params_base = ck["params_base"]
+        samples = ck["samples"]
+        restarts = ck["restarts"]
+        start = ck["restart"]
+        best = ck["best"]
+        solve_state = ck["solve"]
+        print(f"resuming at restart {start + 1}/{restarts}")
+
+    ck_path = args.checkpoint or args.resume
+
+    def write_ck(t: int, state) -> None:
+        save_checkpoint(ck_path, {
+            "params_base": params_base,
+            "samples": samples,
+            "restarts": restarts,
+            "restart": t,
+            "best": best,
+            "solve": state
+        })
 
-    best = None
+    solver = Solver(params_base, samples)
+    restart_ms = []
 
-    for t in range(max(1, args.restarts)):
+    for t in range(start, restarts):
         params = dict(params_base)
-        if args.seed is not None:
-            params["seed"] = args.seed + t
+        if params_base["seed"] is not None:
+            params["seed"] = params_base["seed"] + t
 
-        solve_out = solve(params, samples)
+        on_ck = (lambda state, t=t: write_ck(t, state)) if ck_path else None
+        solve_out = solver.run(params["seed"], on_checkpoint=on_ck, checkpoint_every_s=args.checkpoint_every, resume=solve_state)
+        solve_state = None
         groups = solve_out.get("groups", [])
         stats = solve_out.get("stats", {})
-        val_out = validate(params, sorted(samples), groups)
+        val_out = validate(params, sorted(samples), groups, workers=args.validate_workers)
 
         cand = {
             "params": params,
@@ -57,27 +100,13 @@ def cmd_run(args: argparse.Namespace) -> None:
             "stats": stats,
             "validate": val_out
         }
+        restart_ms.append(stats.get("runtime_ms", 0))
 
-        if best is None:
-            best = cand
-            continue
-
-        bpass = best["validate"].get("pass") is True
-        cpass = val_out.get("pass") is True
-
-        if cpass and not bpass:
+        if better_result(cand, best):
             best = cand
-            continue
-
-        if cpass and bpass:
-            if len(groups) < len(best["groups"]):
-                best = cand
-            continue
 
-        if (not cpass) and (not bpass):
-            if val_out.get("failed_J_count", 10**18) < best["validate"].get("failed_J_count", 10**18):
-                best = cand
-            continue
+        if ck_path:
+            write_ck(t + 1, None)
 
     # 如果启用了 --keep-best-only，检查文件是否已经存在
     if args.keep_best_only:
@@ -88,11 +117,15 @@ def cmd_run(args: argparse.Namespace) -> None:
 
     filename = save_run(DB_DIR, best["params"], best["samples"], best["groups"], best["stats"], best["validate"])
 
+    if ck_path:
+        remove_checkpoint(ck_path)
+
     print("saved:", filename)
     print("params:", best["params"])
     print("samples:", sorted(best["samples"]))
     print("stats:", best["stats"])
     print("validate:", best["validate"])
+    print(f"setup_ms: {solver.setup_ms}, restart_ms: {restart_ms}")
     print("groups:")
     for i, g in enumerate(best["groups"], 1):
         print(i, g)
@@ -100,13 +133,78 @@ def cmd_run(args: argparse.Namespace) -> None:
 
 
 
-def cmd_list(_: argparse.Namespace) -> None:
-    files = list_runs(DB_DIR)
-    if not files:
+def cmd_grow(args: argparse.Namespace) -> None:
+    if args.samples is None:
+        samples = random.sample(range(1, args.m + 1), args.n)
+    else:
+        samples = parse_samples(args.samples)
+    if len(samples) != args.n:
+        print("len(samples)!=n")
+        return
+
+    n_from = max(args.k, args.n_from)
+    groups = []
+    for n in range(n_from, args.n + 1):
+        params = {
+            "m": args.m,
+            "n": n,
+            "k": args.k,
+            "j": args.j,
+            "s": args.s,
+            "seed": args.seed,
+            "max_groups": args.max_groups,
+            "time_limit_ms": args.time_limit_ms,
+            "trials": args.trials,
+            "score_cap": args.score_cap,
+            "enum_work_limit": args.enum_work_limit
+        }
+        if n == n_from:
+            solve_out = solve(params, samples[:n])
+        else:
+            solve_out = solve_incremental(params, samples[:n], groups)
+        groups = solve_out.get("groups", [])
+        stats = solve_out.get("stats", {})
+        val_out = validate(params, sorted(samples[:n]), groups)
+
+        filename = save_run(DB_DIR, params, samples[:n], groups, stats, val_out)
+        print(n, "y =", len(groups), "pass =", val_out.get("pass"), "method =", stats.get("method"), "runtime_ms =", stats.get("runtime_ms"), "saved:", filename)
+        if val_out.get("pass") is not True:
+            print("cover failed at n =", n, "; stopping")
+            return
+
+
+def cmd_list(args: argparse.Namespace) -> None:
+    entries = refresh_index(DB_DIR)
+    if not entries:
         print("no db files")
         return
-    for f in files:
-        print(f)
+    if args.best:
+        best = {}
+        for e in entries:
+            if e["hash"] is None:
+                continue
+            key = (e["n"], e["k"], e["j"], e["s"])
+            b = best.setdefault(key, None)
+            if e["pass"] and (b is None or e["y"] < b["y"]):
+                best[key] = e
+        for (n, k, j, s), b in sorted(best.items()):
+            print(f"n={n} k={k} j={j} s={s}:", f"{b['file']} (y={b['y']})" if b else "no passing run")
+        return
+    for e in entries:
+        if e.get("unreadable"):
+            print(e["file"], "unreadable")
+            continue
+        print(e["file"], f"y={e['y']}", "pass" if e["pass"] else "-")
+
+
+def cmd_compact(args: argparse.Namespace) -> None:
+    out = compact_runs(DB_DIR, keep_top=args.keep_top, dry_run=args.dry_run)
+    verb = "would remove" if args.dry_run else "removed"
+    for f in out["duplicates"]:
+        print(verb, "duplicate:", f)
+    for f in out["dropped"]:
+        print(verb, "beyond top-N:", f)
+    print(f"{len(out['duplicates'])} duplicates, {len(out['dropped'])} beyond top-N")
 
 
 def cmd_execute(args: argparse.Namespace) -> None:
@@ -119,7 +217,7 @@ def cmd_execute(args: argparse.Namespace) -> None:
     samples = data.get("samples", [])
     groups = data.get("groups", [])
 
-    val_out = validate(params, samples, groups)
+    val_out = validate(params, samples, groups, workers=args.validate_workers)
 
     print("file:", args.filename)
     print("params:", params)
@@ -146,11 +244,40 @@ def cmd_execute(args: argparse.Namespace) -> None:
 
 
 
+def cmd_verify_all(args: argparse.Namespace) -> None:
+    from verify import verify_all
+
+    report = verify_all(DB_DIR, workers=args.workers, use_cache=(not args.no_cache))
+    counts = {}
+    for r in report:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+        if r["status"] == "unreadable":
+            print("unreadable:", r["file"], r.get("error", ""))
+        if r["status"] in ("mismatch", "missing"):
+            print(r["status"] + ":", r["file"])
+            print("  validate(db):", r["stored"])
+            print("  validate(now):", r["fresh"])
+
+    cached = sum(1 for r in report if r["cached"])
+    print(f"{len(report)} runs, {cached} from cache:", ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print("report:", args.report)
+
+
 def cmd_delete(args: argparse.Namespace) -> None:
     ok = delete_run(DB_DIR, args.filename)
     print("deleted" if ok else "file not found")
 
 
+def cmd_serve(args: argparse.Namespace) -> None:
+    from server import run_server
+
+    run_server(DB_DIR, args.host, args.port, args.unix, args.workers, args.cache_size)
+
+
 def main() -> None:
     p = argparse.ArgumentParser()
     sub = p.add_subparsers(dest="cmd", required=True)
@@ -159,12 +286,16 @@ def main() -> None:
     prun.add_argument("--restarts", type=int, default=1)
     prun.add_argument("--no-prune", action="store_true")
     prun.add_argument("--keep-best-only", action="store_true")
-
-    prun.add_argument("--m", type=int, required=True)
-    prun.add_argument("--n", type=int, required=True)
-    prun.add_argument("--k", type=int, required=True)
-    prun.add_argument("--j", type=int, required=True)
-    prun.add_argument("--s", type=int, required=True)
+    prun.add_argument("--checkpoint", type=str, default=None)
+    prun.add_argument("--checkpoint-every", type=float, default=60.0)
+    prun.add_argument("--resume", type=str, default=None)
+    prun.add_argument("--validate-workers", type=int, default=1)
+
+    prun.add_argument("--m", type=int, default=None)
+    prun.add_argument("--n", type=int, default=None)
+    prun.add_argument("--k", type=int, default=None)
+    prun.add_argument("--j", type=int, default=None)
+    prun.add_argument("--s", type=int, default=None)
     prun.add_argument("--samples", type=str, default=None)
     prun.add_argument("--seed", type=int, default=None)
     prun.add_argument("--max-groups", type=int, default=200)
@@ -172,20 +303,61 @@ def main() -> None:
     prun.add_argument("--trials", type=int, default=10)
     prun.add_argument("--score-cap", type=int, default=5000)
     prun.add_argument("--enum-work-limit", type=int, default=3000000)
+    prun.add_argument("--cov-cache-dir", type=str, default=COV_CACHE_DIR)
+    prun.add_argument("--no-cov-cache", action="store_true")
+    prun.add_argument("--method", type=str, default="auto", choices=["auto", "greedy_enum", "constructive", "portfolio"])
+    prun.add_argument("--portfolio-workers", type=int, default=0)
 
     prun.set_defaults(func=cmd_run)
 
+    pgrow = sub.add_parser("grow")
+    pgrow.add_argument("--m", type=int, required=True)
+    pgrow.add_argument("--n", type=int, required=True)
+    pgrow.add_argument("--n-from", type=int, default=7)
+    pgrow.add_argument("--k", type=int, required=True)
+    pgrow.add_argument("--j", type=int, required=True)
+    pgrow.add_argument("--s", type=int, required=True)
+    pgrow.add_argument("--samples", type=str, default=None)
+    pgrow.add_argument("--seed", type=int, default=None)
+    pgrow.add_argument("--max-groups", type=int, default=200)
+    pgrow.add_argument("--time-limit-ms", type=int, default=0)
+    pgrow.add_argument("--trials", type=int, default=10)
+    pgrow.add_argument("--score-cap", type=int, default=5000)
+    pgrow.add_argument("--enum-work-limit", type=int, default=3000000)
+    pgrow.set_defaults(func=cmd_grow)
+
     plist = sub.add_parser("list")
+    plist.add_argument("--best", action="store_true")
     plist.set_defaults(func=cmd_list)
 
+    pcompact = sub.add_parser("compact")
+    pcompact.add_argument("--keep-top", type=int, default=0)
+    pcompact.add_argument("--dry-run", action="store_true")
+    pcompact.set_defaults(func=cmd_compact)
+
     pexe = sub.add_parser("execute")
     pexe.add_argument("filename", type=str)
+    pexe.add_argument("--validate-workers", type=int, default=1)
     pexe.set_defaults(func=cmd_execute)
 
+    pver = sub.add_parser("verify-all")
+    pver.add_argument("--workers", type=int, default=0)
+    pver.add_argument("--no-cache", action="store_true")
+    pver.add_argument("--report", type=str, default=None)
+    pver.set_defaults(func=cmd_verify_all)
+
     pdel = sub.add_parser("delete")
     pdel.add_argument("filename", type=str)
     pdel.set_defaults(func=cmd_delete)
 
+    pserve = sub.add_parser("serve")
+    pserve.add_argument("--host", type=str, default="127.0.0.1")
+    pserve.add_argument("--port", type=int, default=8765)
+    pserve.add_argument("--unix", type=str, default=None)
+    pserve.add_argument("--workers", type=int, default=2)
+    pserve.add_argument("--cache-size", type=int, default=256)
+    pserve.set_defaults(func=cmd_serve)
+
     args = p.parse_args()
     args.func(args)
 
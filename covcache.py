@@ -0,0 +1,118 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import List, Optional, Tuple
+
+_MAGIC = b"ASCV"
+_VERSION = 1
+# magic, version, byteorder, n, k, j, s, pad, rows, nnz
+_HEADER = struct.Struct("<4sBcBBBBxxQQ")
+
+
+def table_filename(n: int, k: int, j: int, s: int) -> str:
+    return f"cov-{n}-{k}-{j}-{s}.bin"
+
+
+class CoverageTable:
+    def __init__(self, path: str, expect: Optional[Tuple[int, int, int, int]] = None):
+        self.path = path
+        self._mm = None
+        self._off = None
+        self._idx = None
+        self._view = None
+        self._fh = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                magic, version, order, n, k, j, s, rows, nnz = _HEADER.unpack_from(self._mm, 0)
+            except struct.error:
+                raise ValueError("coverage table header")
+            if magic != _MAGIC or version != _VERSION or order != _byteorder():
+                raise ValueError("coverage table format")
+            if expect is not None and (n, k, j, s) != tuple(expect):
+                raise ValueError("coverage table params")
+            off_end = _HEADER.size + 8 * (rows + 1)
+            if len(self._mm) != off_end + 4 * nnz:
+                raise ValueError("coverage table size")
+            self.n, self.k, self.j, self.s = n, k, j, s
+            self.rows = rows
+            self.nnz = nnz
+            self._view = memoryview(self._mm)
+            self._off = self._view[_HEADER.size:off_end].cast("Q")
+            self._idx = self._view[off_end:off_end + 4 * nnz].cast("I")
+            if self._off[rows] != nnz:
+                raise ValueError("coverage table offsets")
+        except Exception:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, i: int) -> memoryview:
+        return self._idx[self._off[i]:self._off[i + 1]]
+
+    def close(self) -> None:
+        for name in ("_idx", "_off", "_view"):
+            mv = getattr(self, name, None)
+            if mv is not None:
+                mv.release()
+                setattr(self, name, None)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._fh.close()
+
+    def __enter__(self) -> "CoverageTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _byteorder() -> bytes:
+    return b"l" if sys.byteorder == "little" else b"b"
+
+
+def write_table(path: str, n: int, k: int, j: int, s: int, k_masks: List[int], j_masks: List[int]) -> None:
+    offsets = array("Q", [0])
+    indices = array("I")
+    for km in k_masks:
+        for j_idx, jm in enumerate(j_masks):
+            if (km & jm).bit_count() >= s:
+                indices.append(j_idx)
+        offsets.append(len(indices))
+
+    d = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=".cov-", suffix=".tmp", dir=d)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, _byteorder(), n, k, j, s, len(k_masks), len(indices)))
+            offsets.tofile(f)
+            indices.tofile(f)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def open_table(cache_dir: str, n: int, k: int, j: int, s: int, k_masks: List[int], j_masks: List[int]) -> CoverageTable:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, table_filename(n, k, j, s))
+    table: Optional[CoverageTable] = None
+    if os.path.exists(path):
+        try:
+            table = CoverageTable(path, (n, k, j, s))
+        except ValueError:
+            table = None
+        if table is not None and table.rows != len(k_masks):
+            table.close()
+            table = None
+    if table is None:
+        write_table(path, n, k, j, s, k_masks, j_masks)
+        table = CoverageTable(path, (n, k, j, s))
+    return table
@@ -1,6 +1,13 @@
+import hashlib
 import json
 import os
-from typing import Any, Dict, List
+import tempfile
+from typing import Any, Dict, List, Optional
+
+
+INDEX_FILE = "_index.json"
+# solver settings that only make sense on the host that ran the solve
+LOCAL_PARAMS = ("cov_cache_dir",)
 
 
 def ensure_db_dir(db_dir: str) -> None:
@@ -36,7 +43,7 @@ def save_run(db_dir: str, params: Dict[str, Any], samples: List[int], groups: Li
     path = os.path.join(db_dir, filename)
 
     data = {
-        "params": params,
+        "params": {key: v for key, v in params.items() if key not in LOCAL_PARAMS},
         "samples": sorted(samples),
         "groups": groups,
         "stats": stats,
@@ -51,7 +58,7 @@ def save_run(db_dir: str, params: Dict[str, Any], samples: List[int], groups: Li
 
 def list_runs(db_dir: str) -> List[str]:
     ensure_db_dir(db_dir)
-    files = [f for f in os.listdir(db_dir) if f.endswith(".json")]
+    files = [f for f in os.listdir(db_dir) if f.endswith(".json") and not f.startswith("_")]
     files.sort()
     return files
 
@@ -70,3 +77,160 @@ def delete_run(db_dir: str, filename: str) -> bool:
         return False
     os.remove(path)
     return True
+
+
+def canonical_hash(data: Dict[str, Any]) -> Optional[str]:
+    params = data.get("params", {})
+    if not isinstance(params, dict):
+        return None
+    samples = data.get("samples")
+    groups = data.get("groups")
+    if samples is None or groups is None:
+        return None
+    try:
+        key = f"{int(params['n'])}-{int(params['k'])}-{int(params['j'])}-{int(params['s'])}"
+        pos = {v: i for i, v in enumerate(sorted(samples))}
+        masks = set()
+        for g in groups:
+            m = 0
+            for v in g:
+                m |= 1 << pos[v]
+            masks.add(m)
+    except (KeyError, TypeError, ValueError):
+        return None
+    body = key + ":" + ",".join(format(m, "x") for m in sorted(masks))
+    return hashlib.sha1(body.encode("ascii")).hexdigest()
+
+
+def summarize_run(db_dir: str, filename: str) -> Dict[str, Any]:
+    st = os.stat(os.path.join(db_dir, filename))
+    entry = {
+        "file": filename,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "m": None,
+        "n": None,
+        "k": None,
+        "j": None,
+        "s": None,
+        "y": None,
+        "pass": False,
+        "samples": None,
+        "hash": None
+    }
+    try:
+        data = load_run(db_dir, filename)
+    except (ValueError, OSError):
+        entry["unreadable"] = True
+        return entry
+    if not isinstance(data, dict):
+        entry["unreadable"] = True
+        return entry
+
+    params = data.get("params", {})
+    if not isinstance(params, dict):
+        params = {}
+    groups = data.get("groups")
+    entry.update({
+        "m": params.get("m"),
+        "n": params.get("n"),
+        "k": params.get("k"),
+        "j": params.get("j"),
+        "s": params.get("s"),
+        "y": len(groups) if isinstance(groups, list) else None,
+        "pass": isinstance(data.get("validate"), dict) and data["validate"].get("pass") is True,
+        "samples": data.get("samples"),
+        "hash": canonical_hash(data)
+    })
+    return entry
+
+
+def _write_json_atomic(path: str, obj: Any) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def refresh_index(db_dir: str) -> List[Dict[str, Any]]:
+    ensure_db_dir(db_dir)
+    path = os.path.join(db_dir, INDEX_FILE)
+    old = {}
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                old = {e["file"]: e for e in json.load(f)}
+        except (ValueError, KeyError, TypeError, OSError):
+            old = {}
+
+    entries = []
+    changed = False
+    for f in list_runs(db_dir):
+        e = old.pop(f, None)
+        try:
+            st = os.stat(os.path.join(db_dir, f))
+            if e is None or e.get("mtime_ns") != st.st_mtime_ns or e.get("size") != st.st_size:
+                e = summarize_run(db_dir, f)
+                changed = True
+        except OSError:
+            # removed between listdir and stat
+            changed = True
+            continue
+        entries.append(e)
+    if old:
+        changed = True
+
+    if changed or not os.path.exists(path):
+        _write_json_atomic(path, entries)
+    return entries
+
+
+def best_known(db_dir: str, n: int, k: int, j: int, s: int) -> Optional[Dict[str, Any]]:
+    best = None
+    for e in refresh_index(db_dir):
+        if (e["n"], e["k"], e["j"], e["s"]) != (n, k, j, s) or not e["pass"]:
+            continue
+        if best is None or e["y"] < best["y"]:
+            best = e
+    return best
+
+
+def compact_runs(db_dir: str, keep_top: int = 0, dry_run: bool = False) -> Dict[str, List[str]]:
+    entries = refresh_index(db_dir)
+
+    duplicates = []
+    seen = set()
+    survivors = []
+    for e in entries:
+        if e["hash"] is None:
+            survivors.append(e)
+            continue
+        key = (e["n"], e["k"], e["j"], e["s"], e["hash"])
+        if key in seen:
+            duplicates.append(e["file"])
+            continue
+        seen.add(key)
+        survivors.append(e)
+
+    dropped = []
+    if keep_top > 0:
+        by_tuple: Dict[Any, List[Dict[str, Any]]] = {}
+        for e in survivors:
+            if e["hash"] is None:
+                continue
+            by_tuple.setdefault((e["n"], e["k"], e["j"], e["s"]), []).append(e)
+        for runs in by_tuple.values():
+            runs.sort(key=lambda e: (not e["pass"], e["y"], e["file"]))
+            dropped.extend(e["file"] for e in runs[keep_top:])
+
+    if not dry_run:
+        for f in duplicates + dropped:
+            delete_run(db_dir, f)
+        refresh_index(db_dir)
+
+    return {"duplicates": duplicates, "dropped": sorted(dropped)}
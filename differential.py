@@ -0,0 +1,219 @@
+import argparse
+import itertools
+import json
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from solver import Solver, _nCk, _solve_greedy_enum, solve_sweep
+from validator import iter_uncovered, validate
+
+
+def reference_greedy(n: int, k: int, j: int, s: int, samples_sorted: List[int]) -> List[List[int]]:
+    # Verbatim copy of the original AlgSampleSelector.find_min_valid_k_subsets greedy.
+    # It enumerates a set, so ties break in hash order; see _relabel_ref.
+    n_sample_set = set(samples_sorted)
+    j_subsets_set = [set(subset) for subset in itertools.combinations(n_sample_set, j)]
+    all_k_subsets = [sorted(list(subset)) for subset in itertools.combinations(n_sample_set, k)]
+
+    frozen_j_subs = [frozenset(sub) for sub in j_subsets_set]
+    covered_js_list = []
+    for k_sub in all_k_subsets:
+        covered_js = []
+        k_frozen = frozenset(k_sub)
+        for j_idx, j_sub in enumerate(frozen_j_subs):
+            if len(k_frozen & j_sub) >= s:
+                covered_js.append(j_idx)
+        covered_js_list.append(covered_js)
+
+    k_subset_to_covered_js = {}
+    for k_idx, (k_sub, covered_js) in enumerate(zip(all_k_subsets, covered_js_list)):
+        if covered_js:
+            k_subset_to_covered_js[k_idx] = covered_js
+
+    uncovered_js = set(range(len(j_subsets_set)))
+    selected_k_indices = []
+    while uncovered_js:
+        best_k_idx = None
+        best_coverage = set()
+        for k_idx, covered_js in k_subset_to_covered_js.items():
+            coverage = set(covered_js) & uncovered_js
+            if len(coverage) > len(best_coverage):
+                best_coverage = coverage
+                best_k_idx = k_idx
+        if best_k_idx is None:
+            break
+        selected_k_indices.append(best_k_idx)
+        uncovered_js -= best_coverage
+
+    return [all_k_subsets[idx] for idx in selected_k_indices]
+
+
+def random_case(rng: random.Random, n_min: int = 7, n_max: int = 12) -> Dict[str, Any]:
+    n = rng.randint(n_min, n_max)
+    k = rng.randint(4, min(7, n))
+    s = rng.randint(3, k)
+    j = rng.randint(s, k)
+    samples = sorted(rng.sample(range(1, 55), n))
+
+    total_k = _nCk(n, k)
+    if rng.random() < 0.3:
+        groups = reference_greedy(n, k, j, s, samples)
+    else:
+        count = rng.randint(1, min(total_k, 3 * n))
+        groups = [sorted(rng.sample(samples, k)) for _ in range(count)]
+
+    return {"params": {"m": 54, "n": n, "k": k, "j": j, "s": s}, "samples": samples, "groups": groups}
+
+
+def size_bucket(params: Dict[str, Any]) -> str:
+    work = _nCk(params["n"], params["j"]) * _nCk(params["n"], params["k"])
+    if work < 10000:
+        return "small"
+    if work < 200000:
+        return "medium"
+    return "large"
+
+
+def _ref_validate(case: Dict[str, Any]) -> Any:
+    return validate(case["params"], case["samples"], case["groups"])
+
+
+def _validate_backends() -> Dict[str, Tuple[Callable, Callable]]:
+    # name -> (run backend, project (backend output, reference output) to comparable pairs)
+    def fast(case):
+        return validate(case["params"], case["samples"], case["groups"], mode="fast")
+
+    def stream(case):
+        return list(iter_uncovered(case["params"], case["samples"], case["groups"]))
+
+    def sharded(case):
+        return validate(case["params"], case["samples"], case["groups"], workers=2)
+
+    return {
+        "validate_fast": (fast, lambda out, ref: ((out["pass"], out["details"]), (ref["pass"], ref["details"]))),
+        "iter_uncovered": (stream, lambda out, ref: (
+            (len(out), f"uncovered example: {out[0]}" if out else "OK"),
+            (ref["failed_J_count"], ref["details"])
+        )),
+        "validate_sharded": (sharded, lambda out, ref: (out, ref)),
+    }
+
+
+def _relabel_ref(samples_sorted: List[int], groups: List[List[int]]) -> List[List[int]]:
+    # The reference combines samples in set iteration order while greedy_enum uses
+    # sorted order. Mapping the i-th sample of the set to the i-th sorted sample
+    # turns one enumeration into the other, so the selections must then be equal.
+    sigma = {v: samples_sorted[i] for i, v in enumerate(list(set(samples_sorted)))}
+    return [sorted(sigma[v] for v in g) for g in groups]
+
+
+def _ref_greedy(case: Dict[str, Any]) -> Any:
+    p = case["params"]
+    return _relabel_ref(case["samples"], reference_greedy(p["n"], p["k"], p["j"], p["s"], case["samples"]))
+
+
+def _greedy_backends(cache_dir: str) -> Dict[str, Callable]:
+    def plain(case):
+        p = case["params"]
+        return _solve_greedy_enum(p["n"], p["k"], p["j"], p["s"], case["samples"])
+
+    def csr(case):
+        p = case["params"]
+        return _solve_greedy_enum(p["n"], p["k"], p["j"], p["s"], case["samples"], cache_dir)
+
+    def sweep(case):
+        p = case["params"]
+        base = dict(p, prune=False, enum_work_limit=10**12)
+        return solve_sweep(base, case["samples"], [(p["j"], p["s"])])[0]["groups"]
+
+    def solver_obj(case):
+        p = case["params"]
+        return Solver(dict(p, prune=False, method="greedy_enum"), case["samples"]).run()["groups"]
+
+    return {
+        "greedy_enum": plain,
+        "greedy_enum_csr": csr,
+        "solve_sweep": sweep,
+        "Solver": solver_obj,
+    }
+
+
+def _timed(fn: Callable, case: Dict[str, Any]) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    out = fn(case)
+    return out, time.perf_counter() - t0
+
+
+def run_harness(cases: int = 50, seed: int = 0, n_max: int = 12, greedy: bool = True) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    mismatches = []
+
+    def record(name, bucket, ok, ref_t, alt_t, case):
+        e = stats.setdefault(name, {}).setdefault(bucket, {"cases": 0, "mismatches": 0, "ref_s": 0.0, "alt_s": 0.0})
+        e["cases"] += 1
+        e["ref_s"] += ref_t
+        e["alt_s"] += alt_t
+        if not ok:
+            e["mismatches"] += 1
+            mismatches.append({"backend": name, "case": case})
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        v_backends = _validate_backends()
+        g_backends = _greedy_backends(cache_dir)
+        for _ in range(cases):
+            case = random_case(rng, n_max=n_max)
+            bucket = size_bucket(case["params"])
+
+            ref, ref_t = _timed(_ref_validate, case)
+            for name, (fn, project) in v_backends.items():
+                out, alt_t = _timed(fn, case)
+                got, want = project(out, ref)
+                record(name, bucket, got == want, ref_t, alt_t, case)
+
+            if not greedy:
+                continue
+            ref, ref_t = _timed(_ref_greedy, case)
+            for name, fn in g_backends.items():
+                out, alt_t = _timed(fn, case)
+                record(name, bucket, out == ref, ref_t, alt_t, case)
+
+    for buckets in stats.values():
+        for e in buckets.values():
+            e["speedup"] = round(e["ref_s"] / e["alt_s"], 2) if e["alt_s"] > 0 else None
+
+    return {"stats": stats, "mismatches": mismatches}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--cases", type=int, default=50)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--n-max", type=int, default=12)
+    p.add_argument("--no-greedy", action="store_true")
+    p.add_argument("--out", type=str, default=None)
+    args = p.parse_args()
+
+    report = run_harness(args.cases, args.seed, args.n_max, greedy=(not args.no_greedy))
+
+    print(f"{'backend':<18}{'bucket':<8}{'cases':>6}{'mismatch':>10}{'speedup':>9}")
+    for name, buckets in report["stats"].items():
+        for bucket in ("small", "medium", "large"):
+            e = buckets.get(bucket)
+            if e is None:
+                continue
+            print(f"{name:<18}{bucket:<8}{e['cases']:>6}{e['mismatches']:>10}{str(e['speedup']):>9}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if report["mismatches"]:
+        print(f"{len(report['mismatches'])} mismatches")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
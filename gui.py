@@ -1,3 +1,4 @@
+import bisect
 import tkinter as tk
 from tkinter import messagebox
 from solver import solve
@@ -5,6 +6,118 @@ from validator import validate
 from dbio import save_run, list_runs, load_run
 
 
+class RunLines:
+    SECTIONS = [
+        ("Groups", ("groups",)),
+        ("Selected k subsets", ("selected_k_subsets",)),
+        ("Valid k subsets", ("valid_k_subsets",)),
+        ("All j subsets", ("detail_info", "all_j_subsets")),
+        ("All k subsets", ("detail_info", "all_k_subsets")),
+    ]
+
+    def __init__(self, run: dict):
+        self.run = run
+        self.sections = []
+        self.offsets = []
+        total = 0
+        for title, path in self.SECTIONS:
+            items = run
+            for key in path:
+                items = items.get(key) if isinstance(items, dict) else None
+            if not isinstance(items, list):
+                continue
+            self.sections.append((title, items))
+            self.offsets.append(total)
+            total += len(items) + 1
+        self.total = total
+
+    def header(self) -> str:
+        params = self.run.get("params", {})
+        stats = self.run.get("stats", {})
+        val = self.run.get("validate", {})
+        detail = self.run.get("detail_info", {})
+        if not isinstance(detail, dict):
+            detail = {}
+        tup = ", ".join(f"{key}={params[key]}" for key in ("m", "n", "k", "j", "s") if key in params)
+        out = f"Params: {tup}\n"
+        # legacy runs keep their samples under initial_n_samples, sometimes inside detail_info
+        samples = self.run.get("samples", self.run.get("initial_n_samples", detail.get("initial_n_samples")))
+        if samples is not None:
+            out += f"Samples: {samples}\n"
+        if stats:
+            out += f"y={stats.get('y')}  method={stats.get('method')}  runtime_ms={stats.get('runtime_ms')}  stopped={stats.get('stopped')}\n"
+        counts = [f"{key}={detail[key]}" for key in (
+            "total_m_choose_n", "total_n_choose_j", "total_n_choose_k", "valid_k_subsets_count", "selected_k_subsets_count"
+        ) if key in detail]
+        if counts:
+            out += "  ".join(counts) + "\n"
+        if val:
+            out += f"Validation: pass={val.get('pass')}  failed_J_count={val.get('failed_J_count')}  {val.get('details', '')}"
+        return out.rstrip("\n")
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, i: int) -> str:
+        si = bisect.bisect_right(self.offsets, i) - 1
+        title, items = self.sections[si]
+        pos = i - self.offsets[si]
+        if pos == 0:
+            return f"{title} ({len(items)}):"
+        return f"{pos}. {items[pos - 1]}"
+
+
+class PagedResultView(tk.Frame):
+    PAGE_SIZE = 200
+
+    def __init__(self, master, height: int = 10, width: int = 50):
+        super().__init__(master)
+        self.lines = None
+        self.page = 0
+
+        self.header_label = tk.Label(self, text="", justify=tk.LEFT, anchor="w")
+        self.header_label.grid(row=0, column=0, columnspan=3, sticky="w")
+
+        self.text = tk.Text(self, height=height, width=width)
+        self.text.grid(row=1, column=0, columnspan=3)
+
+        self.prev_button = tk.Button(self, text="< Prev", command=self.prev_page)
+        self.prev_button.grid(row=2, column=0)
+        self.page_label = tk.Label(self, text="")
+        self.page_label.grid(row=2, column=1)
+        self.next_button = tk.Button(self, text="Next >", command=self.next_page)
+        self.next_button.grid(row=2, column=2)
+
+    def pages(self) -> int:
+        if not self.lines:
+            return 1
+        return (len(self.lines) + self.PAGE_SIZE - 1) // self.PAGE_SIZE
+
+    def show(self, lines: RunLines) -> None:
+        self.lines = lines
+        self.page = 0
+        self.header_label.config(text=lines.header())
+        self.render()
+
+    def render(self) -> None:
+        self.text.delete(1.0, tk.END)
+        if self.lines:
+            lo = self.page * self.PAGE_SIZE
+            hi = min(len(self.lines), lo + self.PAGE_SIZE)
+            self.text.insert(tk.END, "\n".join(self.lines[i] for i in range(lo, hi)))
+        self.page_label.config(text=f"Page {self.page + 1}/{self.pages()}")
+
+    def prev_page(self) -> None:
+        if self.page > 0:
+            self.page -= 1
+            self.render()
+
+    def next_page(self) -> None:
+        if self.page + 1 < self.pages():
+            self.page += 1
+            self.render()
+
+
 class SampleSelectorApp:
     def __init__(self, root):
         self.root = root
@@ -53,8 +166,8 @@ class SampleSelectorApp:
         self.delete_button.grid(row=6, column=2)
 
         # 结果显示区域
-        self.result_text = tk.Text(root, height=10, width=50)
-        self.result_text.grid(row=7, column=0, columnspan=3)
+        self.result_view = PagedResultView(root, height=10, width=50)
+        self.result_view.grid(row=7, column=0, columnspan=3)
 
     def run_algorithm(self):
         try:
@@ -71,17 +184,8 @@ class SampleSelectorApp:
             stats = solve_out.get("stats", {})
             val_out = validate(params, sorted(samples), groups)
 
-            # 输出结果
-            result_str = f"Params: {params}\n"
-            result_str += f"Stats: {stats}\n"
-            result_str += f"Validation: {val_out}\n"
-            result_str += f"Groups:\n"
-            for i, g in enumerate(groups, 1):
-                result_str += f"{i}. {g}\n"
-            
             # 显示结果
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, result_str)
+            self.result_view.show(RunLines({"params": params, "stats": stats, "validate": val_out, "groups": groups}))
 
             # 保存结果
             save_run("algsample_db", params, samples, groups, stats, val_out)
@@ -92,10 +196,11 @@ class SampleSelectorApp:
 
     def load_result(self):
         filename = self.samples_entry.get()  # For simplicity, use samples input as filename
+        # load_run still parses the whole file (the json module cannot stream); only
+        # the rendering below is paged.
         result = load_run("algsample_db", filename)
         if result:
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"Loaded result:\n{result}")
+            self.result_view.show(RunLines(result))
         else:
             messagebox.showerror("Error", "Result file not found.")
 
@@ -0,0 +1,258 @@
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from solver import solve
+from validator import validate
+from dbio import LOCAL_PARAMS, save_run, load_run, refresh_index
+
+
+def _solve_job(params: Dict[str, Any], samples: List[int]) -> Dict[str, Any]:
+    solve_out = solve(params, samples)
+    groups = solve_out.get("groups", [])
+    return {
+        "groups": groups,
+        "stats": solve_out.get("stats", {}),
+        "validate": validate(params, sorted(samples), groups)
+    }
+
+
+class _BadRequest(ValueError):
+    pass
+
+
+def _parse_params(body: Dict[str, Any]) -> Dict[str, Any]:
+    params = body["params"]
+    if not isinstance(params, dict):
+        raise _BadRequest("params must be an object")
+    out = {key: v for key, v in params.items() if key not in LOCAL_PARAMS}
+    for key in ("m", "n", "k", "j", "s"):
+        if key in out:
+            try:
+                out[key] = int(out[key])
+            except (ValueError, TypeError):
+                raise _BadRequest(f"params.{key} must be an integer")
+    return out
+
+
+def _parse_ints(value: Any, name: str) -> List[int]:
+    if not isinstance(value, list):
+        raise _BadRequest(f"{name} must be a list")
+    try:
+        return [int(x) for x in value]
+    except (ValueError, TypeError):
+        raise _BadRequest(f"{name} must hold integers")
+
+
+def _parse_groups(value: Any) -> List[List[int]]:
+    if not isinstance(value, list):
+        raise _BadRequest("groups must be a list")
+    return [_parse_ints(g, "groups") for g in value]
+
+
+def _validate_job(params: Dict[str, Any], samples: List[int], groups: List[List[int]]) -> Dict[str, Any]:
+    return {"validate": validate(params, samples, groups)}
+
+
+class JobServer:
+    def __init__(self, db_dir: str, workers: int = 2, cache_size: int = 256):
+        self.db_dir = db_dir
+        self.workers = max(1, workers)
+        self.cache_size = max(0, cache_size)
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {"requests": 0, "cache_hits": 0, "db_hits": 0, "coalesced": 0, "solves": 0, "validates": 0}
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self._handle_conn, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle_conn, host, port)
+
+    def address(self) -> Any:
+        return self.server.sockets[0].getsockname()
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+
+    async def serve_forever(self) -> None:
+        async with self.server:
+            await self.server.serve_forever()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        out = self.cache.get(key)
+        if out is not None:
+            self.cache.move_to_end(key)
+        return out
+
+    def _cache_put(self, key: str, value: Dict[str, Any]) -> None:
+        if self.cache_size <= 0:
+            return
+        self.cache[key] = value
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _db_lookup(self, params: Dict[str, Any], samples: List[int]) -> Optional[Dict[str, Any]]:
+        want = sorted(samples)
+        tup = (params["m"], params["n"], params["k"], params["j"], params["s"])
+        best = None
+        for e in refresh_index(self.db_dir):
+            if (e["m"], e["n"], e["k"], e["j"], e["s"]) != tup or e["samples"] != want or not e["pass"]:
+                continue
+            if best is None or e["y"] < best["y"]:
+                best = e
+        if best is None:
+            return None
+        try:
+            data = load_run(self.db_dir, best["file"])
+        except (ValueError, OSError):
+            return None
+        if not data:
+            return None
+        return {"groups": data["groups"], "stats": data.get("stats", {}), "validate": data["validate"], "file": best["file"]}
+
+    async def _run_once(self, key: str, compute) -> Tuple[Dict[str, Any], str]:
+        hit = self._cache_get(key)
+        if hit is not None:
+            self.counters["cache_hits"] += 1
+            return hit, "cache"
+
+        fut = self.inflight.get(key)
+        if fut is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(fut), "coalesced"
+
+        fut = asyncio.get_running_loop().create_future()
+        self.inflight[key] = fut
+        try:
+            result, source = await compute()
+            self._cache_put(key, result)
+            fut.set_result(result)
+            return result, source
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()
+            raise
+        finally:
+            del self.inflight[key]
+
+    async def job_solve(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        params = _parse_params(body)
+        samples = _parse_ints(body["samples"], "samples")
+        save = bool(body.get("save", True))
+        key = json.dumps({"kind": "solve", "params": params, "samples": sorted(samples)}, sort_keys=True)
+
+        async def compute():
+            found = await asyncio.get_running_loop().run_in_executor(None, self._db_lookup, params, samples)
+            if found is not None:
+                self.counters["db_hits"] += 1
+                return found, "db"
+            self.counters["solves"] += 1
+            out = await asyncio.get_running_loop().run_in_executor(self.pool, _solve_job, params, samples)
+            return out, "solve"
+
+        result, source = await self._run_once(key, compute)
+        # save=false and save=true requests share the cache entry, so the first
+        # saving request writes the run, whether it computed it or not
+        if save and "file" not in result and result["groups"]:
+            result["file"] = save_run(self.db_dir, params, samples, result["groups"], result["stats"], result["validate"])
+        return dict(result, source=source)
+
+    async def job_validate(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        params = _parse_params(body)
+        samples = _parse_ints(body["samples"], "samples")
+        groups = _parse_groups(body["groups"])
+        key = json.dumps({"kind": "validate", "params": params, "samples": samples, "groups": groups}, sort_keys=True)
+
+        async def compute():
+            self.counters["validates"] += 1
+            out = await asyncio.get_running_loop().run_in_executor(self.pool, _validate_job, params, samples, groups)
+            return out, "validate"
+
+        result, source = await self._run_once(key, compute)
+        return dict(result, source=source)
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        self.counters["requests"] += 1
+        if method == "GET" and path == "/health":
+            return 200, {"ok": True}
+        if method == "GET" and path == "/stats":
+            return 200, dict(self.counters, cache_size=len(self.cache), inflight=len(self.inflight))
+        if method != "POST" or path not in ("/solve", "/validate"):
+            return 404, {"error": "not found"}
+        try:
+            payload = json.loads(body.decode("utf-8") or "{}")
+        except Exception:
+            return 400, {"error": "bad json"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "body must be a JSON object"}
+        try:
+            if path == "/solve":
+                return 200, await self.job_solve(payload)
+            return 200, await self.job_validate(payload)
+        except KeyError as e:
+            return 400, {"error": f"missing {e}"}
+        except _BadRequest as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def _handle_conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode("latin-1").split()
+                if len(parts) < 2:
+                    break
+                method, path = parts[0], parts[1]
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                status, out = await self.dispatch(method, path, body)
+                data = json.dumps(out, ensure_ascii=False).encode("utf-8")
+                reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+def run_server(db_dir: str, host: str, port: int, unix_path: Optional[str], workers: int, cache_size: int) -> None:
+    async def main():
+        srv = JobServer(db_dir, workers=workers, cache_size=cache_size)
+        await srv.start(host, port, unix_path)
+        print("serving on", srv.address())
+        try:
+            await srv.serve_forever()
+        finally:
+            await srv.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,7 +1,12 @@
 import itertools
+import math
+import multiprocessing
+import os
 import time
 import random
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from covcache import open_table
 
 
 def _nCk(n: int, k: int) -> int:
@@ -30,58 +35,157 @@ def _bits_of_mask(mask: int, n: int) -> List[int]:
     return out
 
 
-def _prune_groups(params: Dict[str, Any], samples_sorted: List[int], groups: List[List[int]]) -> Tuple[List[List[int]], int]:
-    from validator import validate
+def _prune_groups(
+    params: Dict[str, Any], samples_sorted: List[int], groups: List[List[int]], rows: Optional[List[List[int]]] = None
+) -> Tuple[List[List[int]], int]:
+    # Drop, in order, every group whose covered J's are all covered at least twice.
+    # Removing a group only lowers the counts, so a group kept at its turn can never
+    # become removable later and one pass gives the fixed point of repeated passes.
+    if len(groups) <= 1:
+        return groups, 0
 
+    j = int(params["j"])
+    s = int(params["s"])
+    if rows is None:
+        pos = {v: i for i, v in enumerate(samples_sorted)}
+        j_masks = _comb_masks(len(samples_sorted), j)
+        rows = []
+        for g in groups:
+            gm = 0
+            for v in g:
+                gm |= 1 << pos[v]
+            rows.append([idx for idx, jm in enumerate(j_masks) if (gm & jm).bit_count() >= s])
+
+    counts = [0] * _nCk(len(samples_sorted), j)
+    for row in rows:
+        for idx in row:
+            counts[idx] += 1
+
+    if not all(counts):
+        return groups, 0
+
+    kept = []
     removed = 0
-    changed = True
-    while changed and len(groups) > 1:
-        changed = False
-        i = 0
-        while i < len(groups) and len(groups) > 1:
-            candidate = groups[:i] + groups[i + 1 :]
-            r = validate(params, samples_sorted, candidate)
-            if r.get("pass") is True:
-                groups = candidate
-                removed += 1
-                changed = True
-            else:
-                i += 1
-    return groups, removed
-
-
-def _solve_greedy_enum(n: int, k: int, j: int, s: int, samples_sorted: List[int]) -> List[List[int]]:
-    n_set = set(samples_sorted)
-    j_subsets = [frozenset(sub) for sub in itertools.combinations(n_set, j)]
-    all_k = [tuple(sorted(sub)) for sub in itertools.combinations(n_set, k)]
-
-    k_to_cov = {}
-    for k_idx, k_sub in enumerate(all_k):
-        kf = frozenset(k_sub)
-        cov = []
-        for j_idx, jf in enumerate(j_subsets):
-            if len(kf & jf) >= s:
-                cov.append(j_idx)
-        if cov:
-            k_to_cov[k_idx] = cov
-
-    uncovered = set(range(len(j_subsets)))
+    for g, row in zip(groups, rows):
+        if len(groups) - removed > 1 and all(counts[idx] >= 2 for idx in row):
+            for idx in row:
+                counts[idx] -= 1
+            removed += 1
+        else:
+            kept.append(g)
+    return kept, removed
+
+
+def _comb_masks(n: int, r: int) -> List[int]:
+    out = []
+    for comb in itertools.combinations(range(n), r):
+        m = 0
+        for idx in comb:
+            m |= 1 << idx
+        out.append(m)
+    return out
+
+
+def _build_coverage(k_masks: List[int], j_masks: List[int], s: int) -> List[List[int]]:
+    rows = []
+    for km in k_masks:
+        rows.append([j_idx for j_idx, jm in enumerate(j_masks) if (km & jm).bit_count() >= s])
+    return rows
+
+
+def _orbit_reps(cells: List[List[int]], k: int, limit: int) -> Any:
+    # One k-subset per orbit of the Young subgroup fixing every cell: the orbit is
+    # determined by how many indices it takes from each cell, and taking the lowest
+    # indices of each cell gives the lexicographically smallest member.
+    out = []
+
+    def rec(ci: int, need: int, mask: int) -> bool:
+        if need == 0:
+            out.append(mask)
+            return len(out) <= limit
+        if ci == len(cells):
+            return True
+        cell = cells[ci]
+        for c in range(min(need, len(cell)), -1, -1):
+            m = mask
+            for b in cell[:c]:
+                m |= 1 << b
+            if not rec(ci + 1, need - c, m):
+                return False
+        return True
+
+    if not rec(0, k, 0):
+        return None
+    return out
+
+
+def _greedy_cover(n: int, k: int, k_masks: List[int], cov_rows: Any, n_targets: int, uncovered: Any = None) -> List[int]:
+    # While the selection still has a non-trivial stabilizer on sample indices,
+    # candidates in the same orbit have equal gain, so only one representative per
+    # orbit is scored. Cells are the classes of indices with equal membership across
+    # the selected masks; the partition only gets finer, so once the orbit count is
+    # no longer small compared to C(n, k) the plain scan takes over for good.
+    # This needs the target J's to be all of C(n, j), all uncovered, so it is off
+    # when the caller passes its own uncovered set.
+    # Ties go to the first candidate in combination order of the sorted samples
+    # (the orbit representative is the lexicographically smallest member). The
+    # original greedy iterated a set and broke ties in hash order, so the picked
+    # groups can differ from it; the group count and validity are unchanged.
+    cells = [list(range(n))] if uncovered is None else None
+    if uncovered is None:
+        uncovered = set(range(n_targets))
     selected = []
+    mask_to_idx = None
+    rep_limit = len(k_masks) // 4
 
     while uncovered:
         best_k = None
-        best_cov = set()
-        for k_idx, cov_list in k_to_cov.items():
-            cov = uncovered.intersection(cov_list)
-            if len(cov) > len(best_cov):
-                best_cov = cov
+        best_gain = 0
+
+        reps = _orbit_reps(cells, k, rep_limit) if cells is not None else None
+        if reps is None:
+            cells = None
+            candidates = range(len(k_masks))
+        else:
+            if mask_to_idx is None:
+                mask_to_idx = {m: i for i, m in enumerate(k_masks)}
+            candidates = sorted(mask_to_idx[m] for m in reps)
+
+        for k_idx in candidates:
+            gain = len(uncovered.intersection(cov_rows[k_idx]))
+            if gain > best_gain:
+                best_gain = gain
                 best_k = k_idx
         if best_k is None:
             break
         selected.append(best_k)
-        uncovered -= best_cov
-
-    return [list(all_k[idx]) for idx in selected]
+        uncovered.difference_update(cov_rows[best_k])
+
+        if cells is not None:
+            chosen = k_masks[best_k]
+            refined = []
+            for cell in cells:
+                inside = [b for b in cell if (chosen >> b) & 1]
+                outside = [b for b in cell if not (chosen >> b) & 1]
+                if inside:
+                    refined.append(inside)
+                if outside:
+                    refined.append(outside)
+            cells = refined
+
+    return selected
+
+
+def _solve_greedy_enum(n: int, k: int, j: int, s: int, samples_sorted: List[int], cov_cache_dir: Optional[str] = None) -> List[List[int]]:
+    j_masks = _comb_masks(n, j)
+    k_masks = _comb_masks(n, k)
+    if cov_cache_dir:
+        with open_table(cov_cache_dir, n, k, j, s, k_masks, j_masks) as table:
+            selected = _greedy_cover(n, k, k_masks, table, len(j_masks))
+    else:
+        cov_rows = _build_coverage(k_masks, j_masks, s)
+        selected = _greedy_cover(n, k, k_masks, cov_rows, len(j_masks))
+    return [_mask_to_group(k_masks[idx], samples_sorted) for idx in selected]
 
 
 def _solve_constructive(
@@ -94,22 +198,32 @@ def _solve_constructive(
     max_groups: int,
     time_limit_ms: int,
     trials: int,
-    score_cap: int
+    score_cap: int,
+    stop_bound: Optional[Callable[[], int]] = None,
+    j_masks: Optional[List[int]] = None,
+    on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+    checkpoint_every_s: float = 60.0,
+    resume: Optional[Dict[str, Any]] = None
 ) -> Tuple[List[List[int]], str]:
     rng = random.Random(seed) if seed is not None else random.Random()
 
-    j_masks = []
-    for comb in itertools.combinations(range(n), j):
-        m = 0
-        for idx in comb:
-            m |= 1 << idx
-        j_masks.append(m)
+    if j_masks is None:
+        j_masks = _comb_masks(n, j)
 
     uncovered = list(range(len(j_masks)))
     groups_masks = []
 
     t0 = time.perf_counter()
 
+    if resume is not None:
+        groups_masks = list(resume["groups_masks"])
+        uncovered = list(resume["uncovered"])
+        version, internal, gauss = resume["rng_state"]
+        rng.setstate((version, tuple(internal), gauss))
+        t0 -= resume["elapsed_ms"] / 1000.0
+
+    last_ck = time.perf_counter()
+
     def iter_bits(x: int):
         while x:
             lsb = x & -x
@@ -124,9 +238,23 @@ def _solve_constructive(
         return sc
 
     while uncovered:
+        if on_checkpoint is not None and time.perf_counter() - last_ck >= checkpoint_every_s:
+            on_checkpoint({
+                "groups_masks": list(groups_masks),
+                "uncovered": list(uncovered),
+                "rng_state": rng.getstate(),
+                "elapsed_ms": int((time.perf_counter() - t0) * 1000)
+            })
+            last_ck = time.perf_counter()
+
         if max_groups > 0 and len(groups_masks) >= max_groups:
             return [_mask_to_group(m, samples_sorted) for m in groups_masks], "max_groups"
 
+        if stop_bound is not None:
+            bound = stop_bound()
+            if bound > 0 and len(groups_masks) >= bound:
+                return [_mask_to_group(m, samples_sorted) for m in groups_masks], "dominated"
+
         if time_limit_ms > 0:
             now_ms = int((time.perf_counter() - t0) * 1000)
             if now_ms >= time_limit_ms:
@@ -204,7 +332,181 @@ def _solve_constructive(
 
 
 
-def solve(params: Dict[str, Any], samples: List[int]) -> Dict[str, Any]:
+def _solve_method(
+    params: Dict[str, Any],
+    samples_sorted: List[int],
+    method: str,
+    stop_bound: Optional[Callable[[], int]] = None,
+    on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+    checkpoint_every_s: float = 60.0,
+    resume: Optional[Dict[str, Any]] = None
+) -> Tuple[List[List[int]], str]:
+    n = int(params["n"])
+    k = int(params["k"])
+    j = int(params["j"])
+    s = int(params["s"])
+
+    if method == "greedy_enum":
+        return _solve_greedy_enum(n, k, j, s, samples_sorted, params.get("cov_cache_dir", None)), "ok"
+
+    return _solve_constructive(
+        n, k, j, s, samples_sorted,
+        params.get("seed", None),
+        int(params.get("max_groups", 200)),
+        int(params.get("time_limit_ms", 0)),
+        int(params.get("trials", 10)),
+        int(params.get("score_cap", 5000)),
+        stop_bound,
+        None,
+        on_checkpoint,
+        checkpoint_every_s,
+        resume
+    )
+
+
+_PORTFOLIO_BEST = None
+
+
+def _portfolio_init(shared: Any) -> None:
+    global _PORTFOLIO_BEST
+    _PORTFOLIO_BEST = shared
+
+
+def _portfolio_bound() -> int:
+    return _PORTFOLIO_BEST.value if _PORTFOLIO_BEST is not None else 0
+
+
+def _portfolio_worker(name: str, params: Dict[str, Any], samples_sorted: List[int]) -> Dict[str, Any]:
+    from validator import validate
+
+    t0 = time.perf_counter()
+    # The bound is compared with an unpruned selection, so leave room for pruning
+    # before calling a run dominated.
+    slack = float(params.get("portfolio_slack", 0.1))
+
+    def stop_bound() -> int:
+        best = _portfolio_bound()
+        if best <= 0:
+            return 0
+        return best + max(1, int(math.ceil(best * slack)))
+
+    groups, stopped = _solve_method(params, samples_sorted, params["method"], stop_bound)
+    removed = 0
+    if bool(params.get("prune", True)) and groups and stopped != "dominated":
+        groups, removed = _prune_groups(params, samples_sorted, groups)
+    val_out = validate(params, samples_sorted, groups) if groups else {"pass": False, "failed_J_count": -1}
+
+    if val_out.get("pass") is True and _PORTFOLIO_BEST is not None:
+        with _PORTFOLIO_BEST.get_lock():
+            if _PORTFOLIO_BEST.value == 0 or len(groups) < _PORTFOLIO_BEST.value:
+                _PORTFOLIO_BEST.value = len(groups)
+
+    return {
+        "name": name,
+        "groups": groups,
+        "pass": val_out.get("pass") is True,
+        "failed_J_count": val_out.get("failed_J_count", -1),
+        "stopped": stopped,
+        "pruned": removed,
+        "runtime_ms": int((time.perf_counter() - t0) * 1000)
+    }
+
+
+def _portfolio_configs(params: Dict[str, Any], work: int) -> List[Tuple[str, Dict[str, Any]]]:
+    seed = params.get("seed", None)
+    variants = params.get("portfolio", None)
+    if not variants:
+        variants = []
+        if work <= int(params.get("enum_work_limit", 3000000)):
+            variants.append({"method": "greedy_enum"})
+        trials = int(params.get("trials", 10))
+        score_cap = int(params.get("score_cap", 5000))
+        for t, c in ((trials, score_cap), (trials * 3, score_cap // 2), (max(1, trials // 2), score_cap * 4)):
+            for r in range(2):
+                variants.append({"method": "constructive", "trials": t, "score_cap": c, "seed_offset": r})
+
+    out = []
+    for i, v in enumerate(variants):
+        cfg = dict(params)
+        cfg.pop("portfolio", None)
+        cfg.update(v)
+        if v.get("method") not in ("greedy_enum", "constructive"):
+            cfg["method"] = "constructive"
+        cfg.pop("seed_offset", None)
+        if cfg["method"] == "greedy_enum":
+            name = "greedy_enum"
+        else:
+            if seed is not None:
+                cfg["seed"] = int(seed) + int(v.get("seed_offset", i))
+            name = f"constructive#{i}(trials={cfg.get('trials', 10)},score_cap={cfg.get('score_cap', 5000)},seed={cfg.get('seed')})"
+        out.append((name, cfg))
+    return out
+
+
+def _solve_portfolio(params: Dict[str, Any], samples_sorted: List[int], work: int) -> Tuple[List[List[int]], str, Dict[str, Any]]:
+    configs = _portfolio_configs(params, work)
+    time_limit_ms = int(params.get("time_limit_ms", 0))
+    workers = int(params.get("portfolio_workers", 0)) or min(len(configs), os.cpu_count() or 1)
+
+    shared = multiprocessing.Value("i", 0)
+    pool = multiprocessing.Pool(processes=max(1, workers), initializer=_portfolio_init, initargs=(shared,))
+    try:
+        pending = [(name, pool.apply_async(_portfolio_worker, (name, cfg, samples_sorted))) for name, cfg in configs]
+        t0 = time.perf_counter()
+        results = []
+        while pending:
+            still = []
+            for name, ar in pending:
+                if ar.ready():
+                    try:
+                        results.append(ar.get())
+                    except Exception as e:
+                        results.append({"name": name, "groups": [], "pass": False, "failed_J_count": -1, "stopped": f"error: {e}", "pruned": 0, "runtime_ms": 0})
+                else:
+                    still.append((name, ar))
+            pending = still
+            if not pending:
+                break
+            if time_limit_ms > 0 and (time.perf_counter() - t0) * 1000 >= time_limit_ms:
+                break
+            time.sleep(0.01)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    order = {name: i for i, (name, _) in enumerate(configs)}
+    best = None
+    for r in results:
+        if best is None:
+            best = r
+            continue
+        if r["pass"] != best["pass"]:
+            if r["pass"]:
+                best = r
+            continue
+        if r["pass"]:
+            key, bkey = len(r["groups"]), len(best["groups"])
+        else:
+            key, bkey = r["failed_J_count"], best["failed_J_count"]
+        if (key, order[r["name"]]) < (bkey, order[best["name"]]):
+            best = r
+
+    summary = [{"name": r["name"], "y": len(r["groups"]), "pass": r["pass"], "stopped": r["stopped"], "runtime_ms": r["runtime_ms"]} for r in results]
+    for name, _ in pending:
+        summary.append({"name": name, "y": 0, "pass": False, "stopped": "deadline", "runtime_ms": time_limit_ms})
+
+    if best is None:
+        return [], "time_limit", {"winner": None, "portfolio": summary, "pruned": 0}
+    return best["groups"], best["stopped"], {"winner": best["name"], "portfolio": summary, "pruned": best["pruned"]}
+
+
+def solve(
+    params: Dict[str, Any],
+    samples: List[int],
+    on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+    checkpoint_every_s: float = 60.0,
+    resume: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     t0 = time.perf_counter()
 
     n = int(params["n"])
@@ -213,37 +515,31 @@ def solve(params: Dict[str, Any], samples: List[int]) -> Dict[str, Any]:
     s = int(params["s"])
 
     do_prune = bool(params.get("prune", True))
-    seed = params.get("seed", None)
-    max_groups = int(params.get("max_groups", 200))
-    time_limit_ms = int(params.get("time_limit_ms", 0))
-    trials = int(params.get("trials", 10))
-    score_cap = int(params.get("score_cap", 5000))
+    method = str(params.get("method", "auto"))
     enum_work_limit = int(params.get("enum_work_limit", 3000000))
 
     samples_sorted = sorted(samples)
     if len(samples_sorted) != n:
         return {"groups": [], "stats": {"y": 0, "runtime_ms": 0, "method": "error", "error": "len(samples)!=n"}}
+    if method not in ("auto", "greedy_enum", "constructive", "portfolio"):
+        return {"groups": [], "stats": {"y": 0, "runtime_ms": 0, "method": "error", "error": "method"}}
 
     total_j = _nCk(n, j)
     total_k = _nCk(n, k)
     work = total_j * total_k
 
     removed = 0
+    extra = {}
 
-    if work <= enum_work_limit:
-        groups = _solve_greedy_enum(n, k, j, s, samples_sorted)
-        method = "greedy_enum"
-        stopped = "ok"
+    if method == "portfolio":
+        groups, stopped, extra = _solve_portfolio(params, samples_sorted, work)
+        removed = extra.pop("pruned")
     else:
-        groups, stopped = _solve_constructive(
-            n, k, j, s, samples_sorted, seed, max_groups, time_limit_ms, trials, score_cap
-        )
-        method = "constructive"
-        if stopped != "ok" and stopped != "time_limit" and stopped != "max_groups":
-            pass
-
-    if do_prune and groups:
-        groups, removed = _prune_groups(params, samples_sorted, groups)
+        if method == "auto":
+            method = "greedy_enum" if work <= enum_work_limit else "constructive"
+        groups, stopped = _solve_method(params, samples_sorted, method, None, on_checkpoint, checkpoint_every_s, resume)
+        if do_prune and groups:
+            groups, removed = _prune_groups(params, samples_sorted, groups)
 
     t1 = time.perf_counter()
     runtime_ms = int((t1 - t0) * 1000)
@@ -258,6 +554,310 @@ def solve(params: Dict[str, Any], samples: List[int]) -> Dict[str, Any]:
             "total_nCj": total_j,
             "total_nCk": total_k,
             "enum_work": work,
+            "stopped": stopped,
+            **extra
+        }
+    }
+
+
+def solve_incremental(params: Dict[str, Any], samples: List[int], base_groups: List[List[int]]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+
+    n = int(params["n"])
+    k = int(params["k"])
+    j = int(params["j"])
+    s = int(params["s"])
+
+    do_prune = bool(params.get("prune", True))
+    enum_work_limit = int(params.get("enum_work_limit", 3000000))
+
+    if len(samples) != n or len(set(samples)) != n:
+        return {"groups": [], "stats": {"y": 0, "runtime_ms": 0, "method": "error", "error": "len(samples)!=n"}}
+
+    samples_sorted = sorted(samples)
+    pos = {v: i for i, v in enumerate(samples_sorted)}
+    new_idx = pos[samples[-1]]
+    new_bit = 1 << new_idx
+
+    base_masks = []
+    for g in base_groups:
+        m = 0
+        for v in g:
+            if v not in pos or v == samples[-1]:
+                return {"groups": [], "stats": {"y": 0, "runtime_ms": 0, "method": "error", "error": "base_groups"}}
+            m |= 1 << pos[v]
+        base_masks.append(m)
+
+    # Only J's containing the new index are new; drop the ones the base cover already hits.
+    others = [i for i in range(n) if i != new_idx]
+    new_j = []
+    for comb in itertools.combinations(others, j - 1):
+        m = new_bit
+        for idx in comb:
+            m |= 1 << idx
+        if not any((bm & m).bit_count() >= s for bm in base_masks):
+            new_j.append(m)
+
+    total_k = _nCk(n, k)
+    work = len(new_j) * total_k
+
+    if not new_j:
+        added = []
+        method = "incremental"
+        stopped = "ok"
+    elif work <= enum_work_limit:
+        k_masks = _comb_masks(n, k)
+        cov_rows = _build_coverage(k_masks, new_j, s)
+        selected = _greedy_cover(n, k, k_masks, cov_rows, len(new_j), set(range(len(new_j))))
+        added = [_mask_to_group(k_masks[idx], samples_sorted) for idx in selected]
+        method = "incremental_greedy_enum"
+        stopped = "ok"
+    else:
+        added, stopped = _solve_constructive(
+            n, k, j, s, samples_sorted,
+            params.get("seed", None),
+            int(params.get("max_groups", 200)),
+            int(params.get("time_limit_ms", 0)),
+            int(params.get("trials", 10)),
+            int(params.get("score_cap", 5000)),
+            None,
+            new_j
+        )
+        method = "incremental_constructive"
+
+    groups = [_mask_to_group(m, samples_sorted) for m in base_masks] + added
+    removed = 0
+    if do_prune and groups:
+        groups, removed = _prune_groups(params, samples_sorted, groups)
+
+    return {
+        "groups": groups,
+        "stats": {
+            "y": len(groups),
+            "runtime_ms": int((time.perf_counter() - t0) * 1000),
+            "method": method,
+            "pruned": removed,
+            "base_y": len(base_masks),
+            "added": len(added),
+            "new_J": len(new_j),
+            "total_nCj": _nCk(n, j),
+            "total_nCk": total_k,
+            "enum_work": work,
             "stopped": stopped
         }
     }
+
+
+def solve_sweep(params_base: Dict[str, Any], samples: List[int], js_pairs: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    n = int(params_base["n"])
+    k = int(params_base["k"])
+    do_prune = bool(params_base.get("prune", True))
+    enum_work_limit = int(params_base.get("enum_work_limit", 3000000))
+
+    samples_sorted = sorted(samples)
+    if len(samples_sorted) != n:
+        return [{"j": j, "s": s, "groups": [], "stats": {"y": 0, "runtime_ms": 0, "method": "error", "error": "len(samples)!=n"}} for j, s in js_pairs]
+
+    k_masks = None
+    by_j: Dict[int, List[int]] = {}
+    for j, s in js_pairs:
+        by_j.setdefault(int(j), []).append(int(s))
+
+    results = {}
+    for j, s_list in by_j.items():
+        total_j = _nCk(n, j)
+        work = total_j * _nCk(n, k)
+
+        if work > enum_work_limit:
+            for s in s_list:
+                out = solve(dict(params_base, j=j, s=s), samples_sorted)
+                out["stats"]["shared"] = False
+                results[(j, s)] = out
+            continue
+
+        t0 = time.perf_counter()
+        if k_masks is None:
+            k_masks = _comb_masks(n, k)
+        j_masks = _comb_masks(n, j)
+        # sizes[k_idx][j_idx] is |K & J|, one byte per pair. Column i has a 1 byte for
+        # every J holding index i; packed into ints, the columns of K's indices add up
+        # bytewise (no carries since j < 256) to the intersection sizes. The rows for a
+        # given s are the rows for s + 1 plus the J's meeting K in exactly s indices,
+        # so walking s downwards builds each row set from the previous one.
+        width = len(j_masks)
+        cols = [int.from_bytes(bytes((jm >> i) & 1 for jm in j_masks), "little") for i in range(n)]
+        sizes = [sum(cols[i] for i in _bits_of_mask(km, n)).to_bytes(width, "little") for km in k_masks]
+        j_range = range(len(j_masks))
+        setup_ms = int((time.perf_counter() - t0) * 1000)
+
+        cov_rows = [[] for _ in k_masks]
+        row_s = j + 1
+        for s in sorted(set(s_list), reverse=True):
+            t1 = time.perf_counter()
+            params = dict(params_base, j=j, s=s)
+            if not (s <= j <= k):
+                results[(j, s)] = {"groups": [], "stats": {"y": 0, "runtime_ms": 0, "method": "error", "error": "s<=j<=k"}}
+                continue
+            while row_s > s:
+                row_s -= 1
+                exact = bytes(int(t == row_s) for t in range(256))
+                cov_rows = [
+                    row + list(itertools.compress(j_range, sz.translate(exact)))
+                    for row, sz in zip(cov_rows, sizes)
+                ]
+            selected = _greedy_cover(n, k, k_masks, cov_rows, total_j)
+            groups = [_mask_to_group(k_masks[idx], samples_sorted) for idx in selected]
+            removed = 0
+            if do_prune and groups:
+                groups, removed = _prune_groups(params, samples_sorted, groups, [cov_rows[idx] for idx in selected])
+            results[(j, s)] = {
+                "groups": groups,
+                "stats": {
+                    "y": len(groups),
+                    "runtime_ms": int((time.perf_counter() - t1) * 1000),
+                    "setup_ms": setup_ms,
+                    "method": "greedy_enum",
+                    "pruned": removed,
+                    "total_nCj": total_j,
+                    "total_nCk": len(k_masks),
+                    "enum_work": work,
+                    "stopped": "ok",
+                    "shared": True
+                }
+            }
+
+    return [dict(results[(int(j), int(s))], j=int(j), s=int(s)) for j, s in js_pairs]
+
+
+def better_result(cand: Dict[str, Any], best: Optional[Dict[str, Any]]) -> bool:
+    if best is None:
+        return True
+
+    bpass = best["validate"].get("pass") is True
+    cpass = cand["validate"].get("pass") is True
+
+    if cpass and not bpass:
+        return True
+
+    if cpass and bpass:
+        return len(cand["groups"]) < len(best["groups"])
+
+    if (not cpass) and (not bpass):
+        return cand["validate"].get("failed_J_count", 10**18) < best["validate"].get("failed_J_count", 10**18)
+
+    return False
+
+
+class Solver:
+    def __init__(self, params: Dict[str, Any], samples: List[int]):
+        t0 = time.perf_counter()
+
+        self.params = dict(params)
+        self.n = int(params["n"])
+        self.k = int(params["k"])
+        self.j = int(params["j"])
+        self.s = int(params["s"])
+        self.samples_sorted = sorted(samples)
+        self.error = None if len(self.samples_sorted) == self.n else "len(samples)!=n"
+
+        self.total_j = _nCk(self.n, self.j)
+        self.total_k = _nCk(self.n, self.k)
+        self.work = self.total_j * self.total_k
+
+        method = str(params.get("method", "auto"))
+        if method == "auto":
+            method = "greedy_enum" if self.work <= int(params.get("enum_work_limit", 3000000)) else "constructive"
+        if method not in ("greedy_enum", "constructive", "portfolio"):
+            self.error = "method"
+        self.method = method
+
+        self.j_masks = _comb_masks(self.n, self.j) if method == "constructive" and self.error is None else None
+        # greedy_enum ignores the seed, so its pruned result is computed once and reused.
+        self._greedy = None
+
+        self.setup_ms = int((time.perf_counter() - t0) * 1000)
+
+    def run(
+        self,
+        seed: Any = None,
+        on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+        checkpoint_every_s: float = 60.0,
+        resume: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        params = dict(self.params, seed=seed)
+
+        if self.error is not None:
+            return {"groups": [], "stats": {"y": 0, "runtime_ms": 0, "method": "error", "error": self.error}}
+
+        if self.method == "portfolio":
+            out = solve(params, self.samples_sorted)
+            out["stats"]["setup_ms"] = 0
+            return out
+
+        cached = False
+        if self.method == "greedy_enum":
+            if self._greedy is None:
+                groups, stopped = _solve_method(params, self.samples_sorted, "greedy_enum")
+                removed = 0
+                if bool(params.get("prune", True)) and groups:
+                    groups, removed = _prune_groups(params, self.samples_sorted, groups)
+                self._greedy = (groups, removed, stopped)
+            else:
+                cached = True
+            groups, removed, stopped = self._greedy
+            groups = [list(g) for g in groups]
+        else:
+            groups, stopped = _solve_constructive(
+                self.n, self.k, self.j, self.s, self.samples_sorted,
+                seed,
+                int(params.get("max_groups", 200)),
+                int(params.get("time_limit_ms", 0)),
+                int(params.get("trials", 10)),
+                int(params.get("score_cap", 5000)),
+                None,
+                self.j_masks,
+                on_checkpoint,
+                checkpoint_every_s,
+                resume
+            )
+            removed = 0
+            if bool(params.get("prune", True)) and groups:
+                groups, removed = _prune_groups(params, self.samples_sorted, groups)
+
+        return {
+            "groups": groups,
+            "stats": {
+                "y": len(groups),
+                "runtime_ms": int((time.perf_counter() - t0) * 1000),
+                "setup_ms": self.setup_ms,
+                "method": self.method,
+                "pruned": removed,
+                "total_nCj": self.total_j,
+                "total_nCk": self.total_k,
+                "enum_work": self.work,
+                "stopped": stopped,
+                "cached": cached
+            }
+        }
+
+    def best_of(self, restarts: int, seed: Any = None) -> Dict[str, Any]:
+        from validator import validate
+
+        best = None
+        restart_ms = []
+        for t in range(max(1, restarts)):
+            run_seed = seed + t if seed is not None else None
+            out = self.run(run_seed)
+            restart_ms.append(out["stats"]["runtime_ms"])
+            cand = {
+                "seed": run_seed,
+                "groups": out["groups"],
+                "stats": out["stats"],
+                "validate": validate(dict(self.params, seed=run_seed), self.samples_sorted, out["groups"])
+            }
+            if better_result(cand, best):
+                best = cand
+
+        best["stats"] = dict(best["stats"], restarts=len(restart_ms), restart_ms=restart_ms)
+        return best
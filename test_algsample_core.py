@@ -0,0 +1,45 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from algsample_core import AlgSampleSelector
+from validator import validate
+
+
+class TestAlgSampleSelector(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.selector = AlgSampleSelector()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_constructive_path_returns_valid_cover(self):
+        samples = list(range(1, 15))
+        groups, info = self.selector.find_min_valid_k_subsets(45, 14, 6, 5, 4, custom_samples=samples, quiet=True)
+        self.assertEqual(info["solver_stats"]["method"], "constructive")
+        self.assertEqual(info["solver_stats"]["stopped"], "ok")
+        self.assertTrue(validate({"n": 14, "k": 6, "j": 5, "s": 4}, samples, groups)["pass"])
+        self.assertEqual(len(info["all_j_subsets"]), 2002)
+
+    def test_partial_cover_is_rejected(self):
+        samples = list(range(1, 15))
+        groups, info = self.selector.find_min_valid_k_subsets(45, 14, 6, 5, 4, custom_samples=samples, quiet=True, max_groups=5)
+        self.assertEqual(groups, [])
+        self.assertEqual(info, {})
+
+    def test_quiet_prints_nothing_on_errors(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(self.selector.find_min_valid_k_subsets(40, 14, 6, 5, 4, quiet=True), ([], {}))
+            self.selector.find_min_valid_k_subsets(45, 14, 6, 5, 4, custom_samples=list(range(1, 15)), quiet=True, max_groups=5)
+        self.assertEqual(out.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from dbio import save_run, load_run, list_runs, refresh_index, best_known, compact_runs, canonical_hash, INDEX_FILE
+
+
+class TestDbio(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = self.tmp.name
+        self.params = {"m": 45, "n": 7, "k": 6, "j": 5, "s": 5}
+        ok = {"pass": True, "failed_J_count": 0}
+        full = [[a for a in range(1, 8) if a != b] for b in range(1, 8)]
+        save_run(self.db, self.params, [1, 2, 3, 4, 5, 6, 7], full, {}, ok)
+        # same cover with other labels and group order
+        relabeled = [[10 * x for x in g] for g in reversed(full)]
+        save_run(self.db, self.params, [10, 20, 30, 40, 50, 60, 70], relabeled, {}, ok)
+        save_run(self.db, self.params, [1, 2, 3, 4, 5, 6, 7], full[:3], {}, {"pass": False, "failed_J_count": 4})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_canonical_hash_ignores_labels_and_order(self):
+        entries = refresh_index(self.db)
+        self.assertEqual(entries[0]["hash"], entries[1]["hash"])
+        self.assertEqual(canonical_hash({"params": self.params}), None)
+        self.assertNotIn(INDEX_FILE, list_runs(self.db))
+
+    def test_host_local_params_are_not_saved(self):
+        name = save_run(self.db, dict(self.params, cov_cache_dir="/tmp/cov"), [1, 2, 3, 4, 5, 6, 7], [[1, 2, 3, 4, 5, 6]], {}, {})
+        self.assertEqual(load_run(self.db, name)["params"], self.params)
+
+    def test_compact_and_best_known(self):
+        out = compact_runs(self.db, keep_top=0)
+        self.assertEqual(out["duplicates"], ["45-7-6-5-5-2-7.json"])
+        self.assertEqual(len(list_runs(self.db)), 2)
+        self.assertEqual(best_known(self.db, 7, 6, 5, 5)["y"], 7)
+
+        out = compact_runs(self.db, keep_top=1)
+        self.assertEqual(out["dropped"], ["45-7-6-5-5-3-3.json"])
+        self.assertEqual(list_runs(self.db), ["45-7-6-5-5-1-7.json"])
+        self.assertTrue(os.path.exists(os.path.join(self.db, INDEX_FILE)))
+
+    def test_unreadable_run_does_not_break_index(self):
+        with open(os.path.join(self.db, "45-7-6-5-5-9-1.json"), "w", encoding="utf-8") as f:
+            f.write('{"params": ')
+        entries = {e["file"]: e for e in refresh_index(self.db)}
+        bad = entries["45-7-6-5-5-9-1.json"]
+        self.assertTrue(bad["unreadable"])
+        self.assertIsNone(bad["hash"])
+        self.assertFalse(bad["pass"])
+        self.assertEqual(best_known(self.db, 7, 6, 5, 5)["y"], 7)
+        compact_runs(self.db)
+        self.assertIn("45-7-6-5-5-9-1.json", list_runs(self.db))
+
+    def test_concurrent_refresh(self):
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    refresh_index(self.db)
+                    save_run(self.db, self.params, [1, 2, 3, 4, 5, 6, 7], [[1, 2, 3, 4, 5, 6]], {}, {"pass": False})
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
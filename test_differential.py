@@ -0,0 +1,15 @@
+import unittest
+
+from differential import run_harness
+
+
+class TestDifferential(unittest.TestCase):
+    def test_backends_agree_with_reference(self):
+        report = run_harness(cases=12, seed=2, n_max=10)
+        self.assertEqual(report["mismatches"], [])
+        for name in ("validate_fast", "iter_uncovered", "validate_sharded", "greedy_enum", "greedy_enum_csr", "solve_sweep", "Solver"):
+            self.assertEqual(sum(e["cases"] for e in report["stats"][name].values()), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from server import JobServer
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.loop = asyncio.new_event_loop()
+        self.srv = JobServer(self.tmp.name, workers=1, cache_size=8)
+        self.loop.run_until_complete(self.srv.start("127.0.0.1", 0))
+        self.port = self.srv.address()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        asyncio.run_coroutine_threadsafe(self.srv.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.tmp.cleanup()
+
+    def request(self, method, path, payload=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+        body = json.dumps(payload) if payload is not None else None
+        conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        out = json.loads(resp.read())
+        conn.close()
+        return resp.status, out
+
+    def test_solve_dedup_and_cache(self):
+        job = {"params": {"m": 45, "n": 8, "k": 6, "j": 5, "s": 4}, "samples": [8, 1, 2, 3, 4, 5, 6, 7]}
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.request("POST", "/solve", job))) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([r[0] for r in results], [200, 200, 200])
+        self.assertTrue(all(r[1]["validate"]["pass"] for r in results))
+
+        status, again = self.request("POST", "/solve", job)
+        self.assertEqual(again["source"], "cache")
+
+        _, stats = self.request("GET", "/stats")
+        self.assertEqual(stats["solves"], 1)
+        self.assertEqual(stats["coalesced"] + stats["cache_hits"], 3)
+
+    def test_solve_answers_from_db(self):
+        job = {"params": {"m": 45, "n": 7, "k": 6, "j": 5, "s": 5}, "samples": [1, 2, 3, 4, 5, 6, 7]}
+        self.request("POST", "/solve", job)
+        self.srv.cache.clear()
+        _, out = self.request("POST", "/solve", job)
+        self.assertEqual(out["source"], "db")
+
+    def test_validate(self):
+        job = {"params": {"n": 7, "k": 6, "j": 5, "s": 5}, "samples": [1, 2, 3, 4, 5, 6, 7], "groups": [[1, 2, 3, 4, 5, 6]]}
+        status, out = self.request("POST", "/validate", job)
+        self.assertEqual(status, 200)
+        self.assertFalse(out["validate"]["pass"])
+        status, _ = self.request("POST", "/validate", {"params": {}})
+        self.assertEqual(status, 400)
+
+    def test_malformed_input_is_400(self):
+        params = {"m": 45, "n": 7, "k": 6, "j": 5, "s": 5}
+        for path, job in (
+            ("/solve", [1, 2]),
+            ("/solve", {"params": params, "samples": [1, 2, 3, 4, 5, 6, "x"]}),
+            ("/solve", {"params": dict(params, n="seven"), "samples": [1, 2, 3, 4, 5, 6, 7]}),
+            ("/solve", {"params": [1], "samples": [1, 2, 3, 4, 5, 6, 7]}),
+            ("/validate", {"params": params, "samples": [1, 2, 3, 4, 5, 6, 7], "groups": [[1, None]]}),
+            ("/validate", {"params": params, "samples": 7, "groups": []}),
+        ):
+            status, out = self.request("POST", path, job)
+            self.assertEqual(status, 400, (path, job, out))
+
+    def test_unsaved_result_is_saved_later(self):
+        job = {"params": {"m": 45, "n": 7, "k": 6, "j": 5, "s": 5}, "samples": [1, 2, 3, 4, 5, 6, 7]}
+        _, first = self.request("POST", "/solve", dict(job, save=False))
+        self.assertNotIn("file", first)
+        _, second = self.request("POST", "/solve", job)
+        self.assertEqual(second["source"], "cache")
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, second["file"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
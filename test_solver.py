@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from solver import Solver, solve, solve_incremental, solve_sweep, _comb_masks, _build_coverage, _greedy_cover
+from validator import validate
+
+
+class TestSolver(unittest.TestCase):
+    def test_greedy_enum_valid(self):
+        params = {"n": 9, "k": 6, "j": 5, "s": 4}
+        samples = [3, 8, 11, 17, 20, 24, 31, 40, 45]
+        out = solve(params, samples)
+        self.assertEqual(out["stats"]["method"], "greedy_enum")
+        self.assertTrue(validate(params, sorted(samples), out["groups"])["pass"])
+
+    def test_orbit_reduction_matches_full_scan(self):
+        n, k, j, s = 10, 6, 5, 4
+        j_masks = _comb_masks(n, j)
+        k_masks = _comb_masks(n, k)
+        rows = _build_coverage(k_masks, j_masks, s)
+
+        uncovered = set(range(len(j_masks)))
+        expected = []
+        while uncovered:
+            gains = [len(uncovered.intersection(r)) for r in rows]
+            best = max(range(len(rows)), key=lambda i: (gains[i], -i))
+            expected.append(best)
+            uncovered.difference_update(rows[best])
+
+        self.assertEqual(_greedy_cover(n, k, k_masks, rows, len(j_masks)), expected)
+
+    def test_cov_cache_matches_in_memory(self):
+        params = {"n": 10, "k": 6, "j": 5, "s": 4}
+        samples = list(range(1, 11))
+        plain = solve(params, samples)
+        with tempfile.TemporaryDirectory() as d:
+            cached = dict(params, cov_cache_dir=d)
+            first = solve(cached, samples)
+            self.assertTrue(os.path.exists(os.path.join(d, "cov-10-6-5-4.bin")))
+            second = solve(cached, samples)
+        self.assertEqual(plain["groups"], first["groups"])
+        self.assertEqual(plain["groups"], second["groups"])
+
+    def test_damaged_cov_table_is_rebuilt(self):
+        params = {"n": 9, "k": 6, "j": 5, "s": 4}
+        samples = list(range(1, 10))
+        with tempfile.TemporaryDirectory() as d:
+            cached = dict(params, cov_cache_dir=d)
+            first = solve(cached, samples)
+            path = os.path.join(d, "cov-9-6-5-4.bin")
+            with open(path, "r+b") as f:
+                f.truncate(os.path.getsize(path) - 3)
+            self.assertEqual(solve(cached, samples)["groups"], first["groups"])
+            os.replace(path, os.path.join(d, "cov-9-6-5-3.bin"))
+            self.assertEqual(solve(dict(cached, s=3), samples)["groups"], solve(dict(params, s=3), samples)["groups"])
+
+    def test_portfolio_reports_winner(self):
+        params = {"n": 12, "k": 6, "j": 5, "s": 4, "seed": 3, "method": "portfolio", "portfolio_workers": 2, "time_limit_ms": 20000}
+        samples = list(range(1, 13))
+        out = solve(params, samples)
+        stats = out["stats"]
+        self.assertEqual(stats["method"], "portfolio")
+        self.assertIn(stats["winner"], [p["name"] for p in stats["portfolio"]])
+        unseeded = solve(dict(params, seed=None, time_limit_ms=1), samples)["stats"]["portfolio"]
+        self.assertEqual(len({p["name"] for p in unseeded}), len(unseeded))
+        self.assertEqual(stats["y"], min(p["y"] for p in stats["portfolio"] if p["pass"]))
+        self.assertTrue(validate(params, samples, out["groups"])["pass"])
+
+    def test_incremental_growth_stays_valid(self):
+        samples = [5, 9, 14, 2, 30, 41, 7, 22, 18, 33]
+        params = {"n": 7, "k": 6, "j": 5, "s": 4}
+        groups = solve(params, samples[:7])["groups"]
+        for n in range(8, len(samples) + 1):
+            params = {"n": n, "k": 6, "j": 5, "s": 4}
+            out = solve_incremental(params, samples[:n], groups)
+            groups = out["groups"]
+            self.assertTrue(validate(params, sorted(samples[:n]), groups)["pass"])
+            self.assertTrue(all(len(g) == 6 for g in groups))
+
+    def test_resume_from_checkpoint_is_exact(self):
+        params = {"n": 14, "k": 6, "j": 5, "s": 4, "seed": 7, "prune": False, "method": "constructive"}
+        samples = list(range(1, 15))
+        states = []
+        full = solve(params, samples, on_checkpoint=lambda st: states.append(json.loads(json.dumps(st))), checkpoint_every_s=0)
+        self.assertGreater(len(states), 2)
+        mid = states[len(states) // 2]
+        resumed = solve(params, samples, resume=mid)
+        self.assertEqual(full["groups"], resumed["groups"])
+
+    def test_sweep_matches_individual_solves(self):
+        samples = [4, 8, 15, 16, 23, 42, 7, 9, 30]
+        base = {"n": 9, "k": 6}
+        pairs = [(j, s) for j in range(3, 7) for s in range(3, j + 1)]
+        out = solve_sweep(base, samples, pairs)
+        self.assertEqual([(r["j"], r["s"]) for r in out], pairs)
+        for r in out:
+            single = solve(dict(base, j=r["j"], s=r["s"]), samples)
+            self.assertEqual(r["groups"], single["groups"])
+            self.assertTrue(r["stats"]["shared"])
+
+    def test_sweep_beats_individual_solves(self):
+        samples = list(range(1, 13))
+        base = {"n": 12, "k": 6}
+        pairs = [(j, s) for j in (5, 6) for s in (3, 4, 5)]
+
+        def best_time(fn):
+            times = []
+            for _ in range(2):
+                t0 = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - t0)
+            return min(times)
+
+        sweep_s = best_time(lambda: solve_sweep(base, samples, pairs))
+        single_s = best_time(lambda: [solve(dict(base, j=j, s=s), samples) for j, s in pairs])
+        self.assertLess(sweep_s, single_s)
+
+    def test_solver_object_matches_solve(self):
+        params = {"n": 14, "k": 6, "j": 5, "s": 4, "method": "constructive"}
+        samples = list(range(1, 15))
+        solver = Solver(params, samples)
+        for seed in (1, 2):
+            self.assertEqual(solver.run(seed)["groups"], solve(dict(params, seed=seed), samples)["groups"])
+
+        best = solver.best_of(3, seed=1)
+        self.assertEqual(len(best["stats"]["restart_ms"]), 3)
+        self.assertTrue(best["validate"]["pass"])
+
+    def test_solver_reuses_greedy_result(self):
+        solver = Solver({"n": 9, "k": 6, "j": 5, "s": 4}, list(range(1, 10)))
+        first = solver.run(1)
+        second = solver.run(2)
+        self.assertEqual(first["groups"], second["groups"])
+        self.assertTrue(second["stats"]["cached"])
+
+
+if __name__ == "__main__":
+    unittest.main()
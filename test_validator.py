@@ -1,5 +1,5 @@
 import unittest
-from validator import validate
+from validator import validate, iter_uncovered
 
 
 class TestValidator(unittest.TestCase):
@@ -29,6 +29,36 @@ class TestValidator(unittest.TestCase):
         self.assertGreater(r["failed_J_count"], 0)
         self.assertLess(r["min_coverage"], 5)
 
+    def test_fast_mode_stops_at_first_failure(self):
+        params = {"n": 7, "k": 6, "j": 5, "s": 5}
+        samples = [1, 2, 3, 4, 5, 6, 7]
+        groups = [[1, 2, 3, 4, 5, 6]]
+        full = validate(params, samples, groups)
+        fast = validate(params, samples, groups, mode="fast")
+        self.assertFalse(fast["pass"])
+        self.assertEqual(fast["failed_J_count"], 1)
+        self.assertEqual(fast["details"], full["details"])
+        self.assertTrue(fast["partial"])
+        self.assertNotIn("partial", full)
+
+    def test_iter_uncovered(self):
+        params = {"n": 7, "k": 6, "j": 5, "s": 5}
+        samples = [1, 2, 3, 4, 5, 6, 7]
+        groups = [[1, 2, 3, 4, 5, 6]]
+        out = list(iter_uncovered(params, samples, groups))
+        self.assertEqual(len(out), validate(params, samples, groups)["failed_J_count"])
+        self.assertTrue(all(7 in J for J in out))
+        with self.assertRaises(ValueError):
+            next(iter_uncovered(params, samples, [[1, 2]]))
+
+    def test_sharded_matches_serial(self):
+        params = {"n": 9, "k": 6, "j": 4, "s": 3}
+        samples = [2, 4, 6, 8, 10, 12, 14, 16, 18]
+        groups = [[2, 4, 6, 8, 10, 12], [8, 10, 12, 14, 16, 18]]
+        for mode in ("full", "fast"):
+            serial = validate(params, samples, groups, mode=mode)
+            for workers in (2, 3, 7):
+                self.assertEqual(validate(params, samples, groups, mode=mode, workers=workers), serial)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from dbio import save_run
+import verify
+from verify import verify_all
+
+
+class TestVerify(unittest.TestCase):
+    def test_reports_mismatch_and_caches(self):
+        with tempfile.TemporaryDirectory() as db:
+            params = {"m": 45, "n": 7, "k": 6, "j": 5, "s": 5}
+            samples = [1, 2, 3, 4, 5, 6, 7]
+            full = [[a for a in range(1, 8) if a != b] for b in range(1, 8)]
+            ok = {"pass": True, "failed_J_count": 0, "min_coverage": 5, "details": "OK"}
+            save_run(db, params, samples, full, {}, ok)
+            save_run(db, params, samples, full[:1], {}, ok)
+
+            report = verify_all(db, workers=1)
+            self.assertEqual([r["status"] for r in report], ["ok", "mismatch"])
+            self.assertFalse(any(r["cached"] for r in report))
+
+            again = verify_all(db, workers=1)
+            self.assertTrue(all(r["cached"] for r in again))
+            self.assertEqual([r["status"] for r in again], ["ok", "mismatch"])
+
+            with mock.patch.object(verify, "load_run", side_effect=AssertionError("reloaded")):
+                verify_all(db, workers=1)
+
+            with mock.patch.object(verify, "_validator_version", return_value="changed"):
+                self.assertFalse(any(r["cached"] for r in verify_all(db, workers=1)))
+
+    def test_unreadable_run_is_reported(self):
+        with tempfile.TemporaryDirectory() as db:
+            params = {"m": 45, "n": 7, "k": 6, "j": 5, "s": 5}
+            full = [[a for a in range(1, 8) if a != b] for b in range(1, 8)]
+            save_run(db, params, [1, 2, 3, 4, 5, 6, 7], full, {}, {"pass": True, "failed_J_count": 0, "min_coverage": 5})
+            with open(os.path.join(db, "45-7-6-5-5-2-7.json"), "w", encoding="utf-8") as f:
+                f.write('{"params": ')
+            report = verify_all(db, workers=1)
+            self.assertEqual([r["status"] for r in report], ["ok", "unreadable"])
+
+
+if __name__ == "__main__":
+    unittest.main()
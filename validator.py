@@ -1,5 +1,7 @@
 import itertools
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import Any, Dict, Iterator, List, Tuple
 
 
 def _norm_samples(samples: List[int]) -> List[int]:
@@ -35,47 +37,104 @@ def _norm_groups(groups: List[List[int]], k: int, sample_set: set) -> List[Tuple
     return out
 
 
-def validate(params: Dict[str, Any], samples: List[int], groups: List[List[int]]) -> Dict[str, Any]:
+class _InputError(ValueError):
+    pass
+
+
+def _prepare(params: Dict[str, Any], samples: List[int], groups: List[List[int]]) -> Tuple[int, int, List[int], List[set]]:
     try:
         n = int(params["n"])
         k = int(params["k"])
         j = int(params["j"])
         s = int(params["s"])
     except Exception:
-        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": "params"}
+        raise _InputError("params")
 
     if not (s <= j <= k):
-        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": "s<=j<=k"}
+        raise _InputError("s<=j<=k")
 
     try:
         samples_sorted = _norm_samples(samples)
     except Exception:
-        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": "samples"}
+        raise _InputError("samples")
 
     if len(samples_sorted) != n:
-        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": "len(samples)!=n"}
+        raise _InputError("len(samples)!=n")
 
     sample_set = set(samples_sorted)
 
     try:
         norm_groups = _norm_groups(groups, k, sample_set)
     except Exception:
-        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": "groups"}
+        raise _InputError("groups")
 
     if not norm_groups:
-        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": "empty groups"}
+        raise _InputError("empty groups")
+
+    return j, s, samples_sorted, [set(g) for g in norm_groups]
+
+
+def _best_inter(Jset: set, group_sets: List[set], s: int) -> int:
+    best = 0
+    for Gset in group_sets:
+        inter = len(Jset & Gset)
+        if inter > best:
+            best = inter
+            if best >= s:
+                break
+    return best
+
+
+def iter_uncovered(params: Dict[str, Any], samples: List[int], groups: List[List[int]]) -> Iterator[List[int]]:
+    try:
+        j, s, samples_sorted, group_sets = _prepare(params, samples, groups)
+    except _InputError as e:
+        raise ValueError(str(e))
+
+    for J in itertools.combinations(samples_sorted, j):
+        if _best_inter(set(J), group_sets, s) < s:
+            yield list(J)
+
+
+def _lex_unrank(rank: int, n: int, j: int) -> List[int]:
+    out = []
+    c = 0
+    for i in range(j):
+        while True:
+            cnt = comb(n - 1 - c, j - 1 - i)
+            if rank < cnt:
+                break
+            rank -= cnt
+            c += 1
+        out.append(c)
+        c += 1
+    return out
+
 
-    group_sets = [set(g) for g in norm_groups]
+def _lex_next(c: List[int], n: int) -> None:
+    j = len(c)
+    i = j - 1
+    while i >= 0 and c[i] == i + n - j:
+        i -= 1
+    if i < 0:
+        return
+    c[i] += 1
+    for t in range(i + 1, j):
+        c[t] = c[t - 1] + 1
 
+
+def _validate_range(n: int, j: int, s: int, group_masks: List[int], lo: int, hi: int, fast: bool) -> Tuple[int, int, Any]:
     failed = 0
     min_cov = 10**9
     first_fail = None
-
-    for J in itertools.combinations(samples_sorted, j):
-        Jset = set(J)
+    c = _lex_unrank(lo, n, j)
+    for _ in range(lo, hi):
+        jm = 0
+        for b in c:
+            jm |= 1 << b
         best = 0
-        for Gset in group_sets:
-            inter = len(Jset & Gset)
+        for gm in group_masks:
+            inter = (jm & gm).bit_count()
             if inter > best:
                 best = inter
                 if best >= s:
@@ -83,9 +142,81 @@ def validate(params: Dict[str, Any], samples: List[int], groups: List[List[int]]
         if best < s:
             failed += 1
             if first_fail is None:
-                first_fail = list(J)
+                first_fail = list(c)
         if best < min_cov:
             min_cov = best
+        if fast and failed:
+            break
+        _lex_next(c, n)
+    return failed, min_cov, first_fail
+
+
+def _validate_sharded(j: int, s: int, samples_sorted: List[int], group_sets: List[set], workers: int, fast: bool) -> Tuple[int, int, Any]:
+    pos = {v: i for i, v in enumerate(samples_sorted)}
+    group_masks = []
+    for g in group_sets:
+        m = 0
+        for v in g:
+            m |= 1 << pos[v]
+        group_masks.append(m)
+
+    total = comb(len(samples_sorted), j)
+    shards = max(1, min(workers, total))
+    bounds = [total * i // shards for i in range(shards + 1)]
+
+    n = len(samples_sorted)
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        parts = list(pool.map(
+            _validate_range,
+            [n] * shards, [j] * shards, [s] * shards, [group_masks] * shards,
+            bounds[:-1], bounds[1:], [fast] * shards
+        ))
+
+    # Ranges are contiguous in itertools.combinations order, so merging them in
+    # order reproduces the serial scan; fast mode stops at the first failing range.
+    failed = 0
+    min_cov = 10**9
+    first_fail = None
+    for p_failed, p_min, p_first in parts:
+        failed += p_failed
+        min_cov = min(min_cov, p_min)
+        if first_fail is None:
+            first_fail = p_first
+        if fast and failed:
+            break
+    if first_fail is not None:
+        first_fail = [samples_sorted[i] for i in first_fail]
+    return failed, min_cov, first_fail
+
+
+def validate(params: Dict[str, Any], samples: List[int], groups: List[List[int]], mode: str = "full", workers: int = 1) -> Dict[str, Any]:
+    if mode not in ("full", "fast"):
+        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": "mode"}
+
+    try:
+        j, s, samples_sorted, group_sets = _prepare(params, samples, groups)
+    except _InputError as e:
+        return {"pass": False, "failed_J_count": -1, "min_coverage": 0, "details": str(e)}
+
+    fast = mode == "fast"
+
+    failed = 0
+    min_cov = 10**9
+    first_fail = None
+
+    if workers > 1:
+        failed, min_cov, first_fail = _validate_sharded(j, s, samples_sorted, group_sets, workers, fast)
+    else:
+        for J in itertools.combinations(samples_sorted, j):
+            best = _best_inter(set(J), group_sets, s)
+            if best < s:
+                failed += 1
+                if first_fail is None:
+                    first_fail = list(J)
+            if best < min_cov:
+                min_cov = best
+            if fast and failed:
+                break
 
     if min_cov == 10**9:
         min_cov = 0
@@ -93,9 +224,14 @@ def validate(params: Dict[str, Any], samples: List[int], groups: List[List[int]]
     if failed == 0:
         return {"pass": True, "failed_J_count": 0, "min_coverage": int(min_cov), "details": "OK"}
 
-    return {
+    out = {
         "pass": False,
         "failed_J_count": failed,
         "min_coverage": int(min_cov),
         "details": f"uncovered example: {first_fail}"
     }
+    if fast:
+        # fast mode stops at the first failing J (or shard), so the count and
+        # min_coverage only cover the J's scanned so far
+        out["partial"] = True
+    return out
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import validator
+from validator import validate
+from dbio import list_runs, load_run
+
+
+CACHE_FILE = "_verify_cache.json"
+_COMPARED = ("pass", "failed_J_count", "min_coverage")
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _validator_version() -> str:
+    # Cached verdicts are only reused while validator.py is unchanged.
+    return _file_hash(validator.__file__)[:16]
+
+
+def _verify_one(db_dir: str, filename: str) -> Dict[str, Any]:
+    try:
+        data = load_run(db_dir, filename)
+    except (ValueError, OSError) as e:
+        return {"kind": "unreadable", "error": str(e), "stored": None, "fresh": None}
+    if not isinstance(data, dict) or "groups" not in data or "samples" not in data:
+        return {"kind": "legacy", "stored": None, "fresh": None}
+    stored = data.get("validate")
+    fresh = validate(data.get("params", {}), data["samples"], data["groups"])
+    return {"kind": "run", "stored": stored, "fresh": fresh}
+
+
+def _load_cache(db_dir: str) -> Dict[str, Any]:
+    path = os.path.join(db_dir, CACHE_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (ValueError, OSError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(db_dir: str, cache: Dict[str, Any]) -> None:
+    path = os.path.join(db_dir, CACHE_FILE)
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=db_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _status(rec: Dict[str, Any]) -> str:
+    if rec["kind"] != "run":
+        return rec["kind"]
+    stored, fresh = rec["stored"], rec["fresh"]
+    if not isinstance(stored, dict):
+        return "missing"
+    if any(stored.get(key) != fresh.get(key) for key in _COMPARED):
+        return "mismatch"
+    return "ok"
+
+
+def verify_all(db_dir: str, workers: int = 0, use_cache: bool = True) -> List[Dict[str, Any]]:
+    files = list_runs(db_dir)
+    version = _validator_version()
+    keys: Dict[str, Optional[str]] = {}
+    for f in files:
+        try:
+            keys[f] = version + ":" + _file_hash(os.path.join(db_dir, f))
+        except OSError:
+            keys[f] = None
+    cache = _load_cache(db_dir) if use_cache else {}
+
+    todo = [f for f in files if keys[f] is not None and keys[f] not in cache]
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            fresh = list(pool.map(_verify_one, [db_dir] * len(todo), todo, chunksize=max(1, len(todo) // 64)))
+        for f, rec in zip(todo, fresh):
+            cache[keys[f]] = rec
+
+    report = []
+    for f in files:
+        if keys[f] is None:
+            rec = {"kind": "unreadable", "error": "unreadable", "stored": None, "fresh": None}
+        else:
+            rec = cache[keys[f]]
+        out = {"file": f, "status": _status(rec), "cached": f not in todo, "stored": rec["stored"], "fresh": rec["fresh"]}
+        if "error" in rec:
+            out["error"] = rec["error"]
+        report.append(out)
+
+    if use_cache:
+        # Unreadable files may be mid-write, so their verdicts are not kept.
+        live = {keys[f] for f in files if keys[f] is not None}
+        _save_cache(db_dir, {h: v for h, v in cache.items() if h in live and v["kind"] != "unreadable"})
+    return report